@@ -6,11 +6,15 @@ Run with:
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from backend.memory.embeddings import get_embedder
 from backend.routes.crew_routes import router as crew_router
 
 logging.basicConfig(
@@ -18,10 +22,31 @@ logging.basicConfig(
     format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
 )
 
+logger = logging.getLogger(__name__)
+
+
+# ---- Startup ------------------------------------------------------------ #
+async def _warm_embeddings() -> None:
+    """Load the shared embedding model and run one encode off the loop."""
+    try:
+        await asyncio.to_thread(get_embedder().embed, ["warmup"])
+        logger.info("Embedding model warmed up.")
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Embedding warm-up skipped: %s", exc)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getenv("FALCONEYE_WARM_EMBEDDINGS", "1") == "1":
+        await _warm_embeddings()
+    yield
+
+
 app = FastAPI(
     title="FalconEye API",
     description="RAG-enhanced OSINT Agentic Tool",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # ---- CORS (allow the Vite dev server) --------------------------------- #
@@ -8,20 +8,39 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 # Default model – small and fast; swap for a larger model in production.
 _DEFAULT_MODEL = "all-MiniLM-L6-v2"
 
+# Mini-batch size for ``model.encode`` – large enough to amortise kernel
+# launches, small enough to keep padding waste low for short chunks.
+_DEFAULT_BATCH_SIZE = 64
+
+# Maximum number of chunk embeddings kept in the in-process LRU cache.
+_DEFAULT_CACHE_SIZE = 10_000
+
 
 @dataclass
 class EmbeddingService:
     """Generate embeddings from text using ``sentence-transformers``."""
 
     model_name: str = _DEFAULT_MODEL
+    cache_size: int = _DEFAULT_CACHE_SIZE
     _model: object = field(default=None, init=False, repr=False)
+    _cache: OrderedDict[str, np.ndarray] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
 
     # ------------------------------------------------------------------ #
     # Lazy model loading
@@ -29,31 +48,105 @@ class EmbeddingService:
     def _get_model(self):  # noqa: ANN202
         if self._model is None:
             try:
+                import torch
                 from sentence_transformers import SentenceTransformer
-
-                self._model = SentenceTransformer(self.model_name)
-                logger.info("Loaded embedding model: %s", self.model_name)
             except ImportError:
                 raise ImportError(
                     "sentence-transformers is required for embeddings. "
                     "Install it with: pip install sentence-transformers"
                 )
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            model = SentenceTransformer(self.model_name, device=device)
+            if device == "cuda":
+                # FP16 halves memory bandwidth and uses tensor cores.
+                model.half()
+            self._model = model
+            logger.info("Loaded embedding model: %s (%s)", self.model_name, device)
         return self._model
 
+    # ------------------------------------------------------------------ #
+    # Encoding
+    # ------------------------------------------------------------------ #
+    def _encode(self, texts: list[str], batch_size: int) -> np.ndarray:
+        model = self._get_model()  # raises the install hint if deps are missing
+        import torch
+
+        # ``encode`` already sorts inputs by length before batching and
+        # restores the original order, so padding waste stays low.
+        with torch.inference_mode():
+            embeddings = model.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_tensor=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        return embeddings.float().cpu().numpy()
+
     # ------------------------------------------------------------------ #
     # Public API
     # ------------------------------------------------------------------ #
-    def embed(self, texts: list[str]) -> list[list[float]]:
-        """Return embeddings for a list of text strings."""
-        model = self._get_model()
-        embeddings = model.encode(texts, show_progress_bar=False)
-        return embeddings.tolist()
+    def embed(
+        self, texts: list[str], batch_size: int = _DEFAULT_BATCH_SIZE
+    ) -> np.ndarray:
+        """Return L2-normalised embeddings as a ``float32`` matrix.
+
+        Row *i* is the embedding of ``texts[i]``. Texts already seen by
+        this service are served from an LRU cache; only cache misses are
+        forwarded to the model.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
 
-    def embed_single(self, text: str) -> list[float]:
+        ids = [self.text_to_id(text) for text in texts]
+        found: dict[str, np.ndarray] = {}
+        misses: dict[str, str] = {}
+
+        with self._lock:
+            for text_id, text in zip(ids, texts):
+                if text_id in found or text_id in misses:
+                    continue
+                vec = self._cache.get(text_id)
+                if vec is None:
+                    misses[text_id] = text
+                else:
+                    self._cache.move_to_end(text_id)
+                    found[text_id] = vec
+
+        if misses:
+            vectors = self._encode(list(misses.values()), batch_size)
+            with self._lock:
+                for text_id, row in zip(misses, vectors):
+                    # Copy so a cached row does not pin the whole batch.
+                    vec = np.array(row, dtype=np.float32)
+                    found[text_id] = vec
+                    self._cache[text_id] = vec
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return np.stack([found[text_id] for text_id in ids])
+
+    def embed_single(self, text: str) -> np.ndarray:
         """Return the embedding vector for a single text string."""
         return self.embed([text])[0]
 
     @staticmethod
     def text_to_id(text: str) -> str:
-        """Deterministic ID for a text chunk (SHA-256 hex digest)."""
-        return hashlib.sha256(text.encode()).hexdigest()[:16]
+        """Deterministic ID for a text chunk (64-bit BLAKE2b hex digest)."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def quantize_int8(embeddings: np.ndarray) -> np.ndarray:
+    """Scalar-quantise L2-normalised embeddings to ``int8`` (scale 127)."""
+    return np.clip(np.rint(embeddings * 127), -127, 127).astype(np.int8)
+
+
+@lru_cache(maxsize=None)
+def get_embedder(model_name: str = _DEFAULT_MODEL) -> EmbeddingService:
+    """Return the process-wide :class:`EmbeddingService` for *model_name*.
+
+    Sharing one instance means the model weights (and the embedding cache)
+    are loaded once per process instead of once per store.
+    """
+    return EmbeddingService(model_name=model_name)
@@ -7,20 +7,87 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Iterable, Iterator
 
-from backend.memory.embeddings import EmbeddingService
+import numpy as np
+from cachetools import TTLCache
+
+from backend.memory.embeddings import EmbeddingService, get_embedder, quantize_int8
+from backend.memory.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Parallel upsert tuning – batches of 100, at most 30 in flight on a
+# 30-thread pool.
+_POOL_THREADS = 30
+_UPSERT_BATCH_SIZE = 100
+_UPSERT_MAX_RETRIES = 3
+_UPSERT_BACKOFF_SECONDS = 0.5
+
+# Query-result caching – exact text match, then near-identical embedding.
+_QUERY_CACHE_SIZE = 1024
+_QUERY_CACHE_TTL_SECONDS = 300.0
+_SIMILAR_QUERY_THRESHOLD = 0.98
+
+
+def _chunks(iterable: Iterable, batch_size: int) -> Iterator[tuple]:
+    """Yield successive *batch_size*-sized tuples from *iterable*."""
+    it = iter(iterable)
+    batch = tuple(islice(it, batch_size))
+    while batch:
+        yield batch
+        batch = tuple(islice(it, batch_size))
+
+
+@dataclass(frozen=True, slots=True)
+class Hit:
+    """A single query match returned by :meth:`PineconeStore.query`."""
+
+    id: str
+    score: float
+    text: str
+    metadata: dict
+
 
 @dataclass
 class PineconeStore:
-    """Thin wrapper around the Pinecone SDK for vector storage."""
+    """Thin wrapper around the Pinecone SDK for vector storage.
+
+    With ``quantize`` enabled, vectors are stored as int8-valued components
+    (a quarter of the JSON payload). Queries stay float32; cosine is
+    scale-invariant, so Pinecone's scores against the int8 vectors need no
+    correction.
+    """
 
     index_name: str
-    embedding_service: EmbeddingService = field(default_factory=EmbeddingService)
+    embedding_service: EmbeddingService = field(default_factory=get_embedder)
+    quantize: bool = field(
+        default_factory=lambda: os.getenv("FALCONEYE_QUANTIZE_EMBEDDINGS") == "1"
+    )
     _index: object = field(default=None, init=False, repr=False)
+    _query_cache: TTLCache = field(
+        default_factory=lambda: TTLCache(
+            maxsize=_QUERY_CACHE_SIZE, ttl=_QUERY_CACHE_TTL_SECONDS
+        ),
+        init=False,
+        repr=False,
+    )
+    _similar_queries: SemanticCache = field(
+        default_factory=lambda: SemanticCache(
+            threshold=_SIMILAR_QUERY_THRESHOLD, ttl=_QUERY_CACHE_TTL_SECONDS
+        ),
+        init=False,
+        repr=False,
+    )
+    _cache_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
 
     # ------------------------------------------------------------------ #
     # Lazy index connection
@@ -36,7 +103,7 @@ class PineconeStore:
                         "PINECONE_API_KEY environment variable is not set."
                     )
                 pc = Pinecone(api_key=api_key)
-                self._index = pc.Index(self.index_name)
+                self._index = pc.Index(self.index_name, pool_threads=_POOL_THREADS)
                 logger.info("Connected to Pinecone index: %s", self.index_name)
             except ImportError:
                 raise ImportError(
@@ -50,37 +117,127 @@ class PineconeStore:
     def upsert(self, texts: list[str], metadata: list[dict] | None = None) -> int:
         """Embed and upsert *texts* into the Pinecone index.
 
+        Returns the number of vectors upserted.
+        """
+        embeddings = self.embedding_service.embed(texts)
+        return self.upsert_embeddings(texts, embeddings, metadata)
+
+    def upsert_embeddings(
+        self,
+        texts: list[str],
+        embeddings: np.ndarray,
+        metadata: list[dict] | None = None,
+    ) -> int:
+        """Upsert pre-computed *embeddings* (row *i* belongs to ``texts[i]``).
+
+        Vectors are sent in batches of 100 in parallel on the client's
+        thread pool; failed batches are retried with exponential backoff.
+
         Returns the number of vectors upserted.
         """
         index = self._get_index()
-        vectors_data = self.embedding_service.embed(texts)
         meta = metadata or [{} for _ in texts]
+        if self.quantize:
+            embeddings = quantize_int8(embeddings).astype(np.float32)
 
-        vectors = [
+        # Rows stay packed float32 until their batch is serialised. At most
+        # _POOL_THREADS batches are in flight (one per client thread); a
+        # batch's float lists are dropped once its request has succeeded.
+        vectors = (
             {
                 "id": EmbeddingService.text_to_id(text),
-                "values": vec,
+                "values": row.tolist(),
                 "metadata": {**m, "text": text},
             }
-            for text, vec, m in zip(texts, vectors_data, meta)
-        ]
+            for text, row, m in zip(texts, embeddings, meta)
+        )
+
+        in_flight: deque[tuple[tuple[dict, ...], Any]] = deque()
+        for batch in _chunks(vectors, _UPSERT_BATCH_SIZE):
+            if len(in_flight) == _POOL_THREADS:
+                self._await_upsert(index, *in_flight.popleft())
+            in_flight.append((batch, index.upsert(vectors=list(batch), async_req=True)))
+        while in_flight:
+            self._await_upsert(index, *in_flight.popleft())
+
+        # New vectors may change any cached answer.
+        self.clear_query_cache()
+        logger.info("Upserted %d vectors into %s", len(texts), self.index_name)
+        return len(texts)
+
+    def query(self, query_text: str, top_k: int = 5) -> list[Hit]:
+        """Query the index and return the *top_k* most relevant chunks.
+
+        Results are cached for a few minutes, both per exact query text and
+        for paraphrases whose embedding is nearly identical to a cached one.
+        """
+        key = (EmbeddingService.text_to_id(query_text), top_k)
+        with self._cache_lock:
+            cached = self._query_cache.get(key)
+        if cached is not None:
+            return cached
+
+        query_vec = self.embedding_service.embed_single(query_text)
+        matches = self._similar_queries.get(query_vec, scope=top_k)
+        if matches is None:
+            matches = self._query_index(query_vec, top_k)
+            self._similar_queries.put(query_vec, matches, scope=top_k)
+
+        with self._cache_lock:
+            self._query_cache[key] = matches
+        return matches
 
-        index.upsert(vectors=vectors)
-        logger.info("Upserted %d vectors into %s", len(vectors), self.index_name)
-        return len(vectors)
+    def clear_query_cache(self) -> None:
+        """Forget every cached query result."""
+        with self._cache_lock:
+            self._query_cache.clear()
+        self._similar_queries.clear()
 
-    def query(self, query_text: str, top_k: int = 5) -> list[dict]:
-        """Query the index and return the *top_k* most relevant chunks."""
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    def _query_index(self, query_vec: np.ndarray, top_k: int) -> list[Hit]:
         index = self._get_index()
-        query_vec = self.embedding_service.embed_single(query_text)
+        results = index.query(
+            vector=query_vec.tolist(), top_k=top_k, include_metadata=True
+        )
+        hits: list[Hit] = []
+        for match in results.matches or []:
+            metadata = match.metadata or {}
+            hits.append(Hit(match.id, match.score, metadata.get("text", ""), metadata))
+        return hits
+
+    @classmethod
+    def _await_upsert(
+        cls, index, batch: tuple[dict, ...], async_result: Any  # noqa: ANN001
+    ) -> None:
+        """Wait for an async upsert of *batch*, retrying it on failure."""
+        try:
+            async_result.get()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Upsert batch failed (%s); retrying", exc)
+            cls._upsert_with_retry(index, batch)
+
+    @staticmethod
+    def _upsert_with_retry(index, batch: tuple[dict, ...]) -> None:  # noqa: ANN001
+        """Re-send a failed batch synchronously with exponential backoff."""
+        for attempt in range(_UPSERT_MAX_RETRIES):
+            time.sleep(_UPSERT_BACKOFF_SECONDS * 2**attempt)
+            try:
+                index.upsert(vectors=list(batch))
+                return
+            except Exception:  # noqa: BLE001
+                if attempt == _UPSERT_MAX_RETRIES - 1:
+                    raise
+                logger.warning(
+                    "Upsert retry %d/%d failed", attempt + 1, _UPSERT_MAX_RETRIES
+                )
 
-        results = index.query(vector=query_vec, top_k=top_k, include_metadata=True)
-        return [
-            {
-                "id": match["id"],
-                "score": match["score"],
-                "text": match.get("metadata", {}).get("text", ""),
-                "metadata": match.get("metadata", {}),
-            }
-            for match in results.get("matches", [])
-        ]
+
+@lru_cache(maxsize=None)
+def get_store(index_name: str) -> PineconeStore:
+    """Return the process-wide :class:`PineconeStore` for *index_name*.
+
+    All callers share one Pinecone connection, query cache and embedder.
+    """
+    return PineconeStore(index_name=index_name, embedding_service=get_embedder())
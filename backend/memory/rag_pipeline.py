@@ -6,28 +6,31 @@ backed by the Pinecone vector store.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import textwrap
 from typing import Any
 
-from backend.memory.pinecone_store import PineconeStore
+from backend.memory.pinecone_store import get_store
 
 logger = logging.getLogger(__name__)
 
+# Async ingest: chunks embedded (and then upserted) per batch, and the
+# number of embedded batches allowed to wait for upsert.
+_INGEST_BATCH_SIZE = 100
+_INGEST_QUEUE_SIZE = 4
+
 
 # ------------------------------------------------------------------ #
 # Text chunking
 # ------------------------------------------------------------------ #
 def chunk_text(text: str, max_chars: int = 500, overlap: int = 50) -> list[str]:
     """Split *text* into overlapping chunks of roughly *max_chars* length."""
-    chunks: list[str] = []
-    start = 0
-    while start < len(text):
-        end = start + max_chars
-        chunks.append(text[start:end])
-        start += max_chars - overlap
-    return chunks
+    step = max_chars - overlap
+    if step <= 0:
+        raise ValueError("overlap must be smaller than max_chars")
+    return [text[start : start + max_chars] for start in range(0, len(text), step)]
 
 
 # ------------------------------------------------------------------ #
@@ -45,8 +48,53 @@ def ingest_text(
     """
     chunks = chunk_text(text, max_chars=max_chars)
     metadata = [{"source": source}] * len(chunks)
-    store = PineconeStore(index_name=index_name)
-    return store.upsert(chunks, metadata)
+    return get_store(index_name).upsert(chunks, metadata)
+
+
+async def ingest_text_async(
+    text: str,
+    index_name: str,
+    source: str = "unknown",
+    max_chars: int = 500,
+) -> int:
+    """Chunk and ingest *text*, overlapping embedding with upserts.
+
+    A producer embeds batches of chunks in a worker thread while a consumer
+    upserts the previous batch, so the model and the network are busy at
+    the same time. Returns the number of vectors upserted.
+    """
+    chunks = chunk_text(text, max_chars=max_chars)
+    store = get_store(index_name)
+    queue: asyncio.Queue[tuple[list[str], Any] | None] = asyncio.Queue(
+        maxsize=_INGEST_QUEUE_SIZE
+    )
+
+    async def produce() -> None:
+        for start in range(0, len(chunks), _INGEST_BATCH_SIZE):
+            batch = chunks[start : start + _INGEST_BATCH_SIZE]
+            embeddings = await asyncio.to_thread(store.embedding_service.embed, batch)
+            await queue.put((batch, embeddings))
+        await queue.put(None)
+
+    async def consume() -> int:
+        total = 0
+        while (item := await queue.get()) is not None:
+            batch, embeddings = item
+            metadata = [{"source": source}] * len(batch)
+            total += await asyncio.to_thread(
+                store.upsert_embeddings, batch, embeddings, metadata
+            )
+        return total
+
+    producer = asyncio.create_task(produce())
+    consumer = asyncio.create_task(consume())
+    try:
+        await asyncio.gather(producer, consumer)
+    finally:
+        # If either side failed, do not leave the other blocked on the queue.
+        producer.cancel()
+        consumer.cancel()
+    return consumer.result()
 
 
 # ------------------------------------------------------------------ #
@@ -60,7 +108,7 @@ def build_rag_tool(index_name: str | None = None) -> Any:
         raise ImportError("crewai is required. Install it with: pip install crewai")
 
     idx = index_name or os.getenv("PINECONE_INDEX", "falconeye")
-    store = PineconeStore(index_name=idx)
+    store = get_store(idx)
 
     @crewai_tool("RAG Search")
     def rag_search(query: str) -> str:
@@ -69,7 +117,7 @@ def build_rag_tool(index_name: str | None = None) -> Any:
         if not results:
             return "No relevant context found in memory."
         parts = [
-            f"[{r['score']:.2f}] {textwrap.shorten(r['text'], 300)}"
+            f"[{r.score:.2f}] {textwrap.shorten(r.text, 300)}"
             for r in results
         ]
         return "\n---\n".join(parts)
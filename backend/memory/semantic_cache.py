@@ -0,0 +1,79 @@
+"""Similarity cache for FalconEye's RAG pipeline.
+
+Keeps a fixed-size ring buffer of recent embeddings and the results that
+were computed for them, so a near-identical follow-up (cosine similarity
+above a threshold) can reuse the stored result instead of recomputing it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Hashable
+
+import numpy as np
+
+
+@dataclass
+class SemanticCache:
+    """Reuse cached values for embeddings that are nearly identical.
+
+    Vectors are expected to be L2-normalised, so a dot product is the
+    cosine similarity. Entries expire after *ttl* seconds and are only
+    matched against lookups with the same *scope* (e.g. ``top_k``).
+    """
+
+    threshold: float = 0.98
+    maxsize: int = 512
+    ttl: float = 300.0
+    _vectors: np.ndarray | None = field(default=None, init=False, repr=False)
+    _expires: np.ndarray = field(init=False, repr=False)
+    _entries: list[tuple[Hashable, Any] | None] = field(init=False, repr=False)
+    _next: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._expires = np.zeros(self.maxsize)
+        self._entries = [None] * self.maxsize
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    def get(self, vector: np.ndarray, scope: Hashable = None) -> Any | None:
+        """Return the value stored for the most similar live vector, if any."""
+        with self._lock:
+            if self._vectors is None:
+                return None
+            sims = self._vectors @ vector
+            sims[self._expires <= time.monotonic()] = -np.inf
+            for slot in np.argsort(sims)[::-1]:
+                if sims[slot] < self.threshold:
+                    break
+                entry = self._entries[slot]
+                if entry is not None and entry[0] == scope:
+                    return entry[1]
+        return None
+
+    def put(self, vector: np.ndarray, value: Any, scope: Hashable = None) -> None:
+        """Store *value* for *vector*, overwriting the oldest slot when full."""
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros(
+                    (self.maxsize, vector.shape[0]), dtype=np.float32
+                )
+            slot = self._next
+            self._vectors[slot] = vector
+            self._expires[slot] = time.monotonic() + self.ttl
+            self._entries[slot] = (scope, value)
+            self._next = (slot + 1) % self.maxsize
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._vectors = None
+            self._expires[:] = 0
+            self._entries = [None] * self.maxsize
+            self._next = 0
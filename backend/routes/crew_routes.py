@@ -4,24 +4,38 @@ from __future__ import annotations
 
 import ast
 import asyncio
-import json
 import logging
+import os
 import re
 import uuid
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import Annotated, Any
 
+import orjson
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from backend.services.safety_filter import SafetyFilter
+from backend.services.crew_cache import get_crew_cache
+from backend.services.crew_runner import STREAM_POOL, start_kickoff, wait_for_kickoff
+from backend.services.rate_limiter import MeteredLimiter, get_rate_limiter
+from backend.services.safety_filter import get_safety_filter
+from backend.services.step_sink import AsyncStepSink
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["crew"])
 
-safety = SafetyFilter()
+# Formatting (regex + parse) runs off the event loop on a small pool.
+_FORMAT_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="log-format")
 
+# Upper bound on a single crew run's working time, in seconds (waits for
+# the shared rate limiter do not count); logs streamed so far stay
+# visible when it is hit. The crew's worker thread cannot be interrupted,
+# so a timed-out run keeps spending LLM/Serper budget until it finishes;
+# its report is then cached for the next request.
+_KICKOFF_TIMEOUT = float(os.getenv("FALCONEYE_KICKOFF_TIMEOUT", "300"))
 
 # ------------------------------------------------------------------ #
 # Request / Response models
@@ -37,6 +51,20 @@ class CrewRequest(BaseModel):
     )
 
 
+class CrewBatchRequest(BaseModel):
+    """Payload to run FalconEye against several targets at once."""
+
+    targets: list[Annotated[str, Field(min_length=1, max_length=200)]] = Field(
+        ..., min_length=1, max_length=100, description="OSINT targets to scan."
+    )
+    pinecone_index: str | None = Field(
+        default=None, description="Optional Pinecone index name for RAG."
+    )
+    concurrency: int = Field(
+        default=8, ge=1, le=32, description="Crews allowed to run at once."
+    )
+
+
 class CrewResult(BaseModel):
     run_id: str
     status: str
@@ -46,13 +74,33 @@ class CrewResult(BaseModel):
 # ------------------------------------------------------------------ #
 # Log formatting helpers
 # ------------------------------------------------------------------ #
+_TOOL_RESULT_PREFIX = "ToolResult(result="
+_AGENT_ACTION_PREFIX = "AgentAction(thought="
+
+# Fallbacks for wrappers whose quoting the str.find fast path cannot follow.
 _TOOL_RESULT_RE = re.compile(
-    r"^ToolResult\(result=['\"](.+?)['\"],\s*result_as_answer=", re.DOTALL
+    r"^ToolResult\(result=['\"](.+?)['\"],\s*result_as_answer=",
+    re.DOTALL | re.ASCII,
 )
 _AGENT_ACTION_RE = re.compile(
-    r"^AgentAction\(thought=['\"](.+?)['\"],\s*tool=['\"](.+?)['\"]", re.DOTALL
+    r"^AgentAction\(thought=['\"](.+?)['\"],\s*tool=['\"](.+?)['\"]",
+    re.DOTALL | re.ASCII,
 )
 
+# Python-repr string quotes: a ' not flanked by word characters on both
+# sides (apostrophes as in "Bob's" are left alone). Backslash-escaped
+# quotes (``Bob\'s``) are skipped too and left to ``ast.literal_eval``.
+_PY_QUOTE_RE = re.compile(r"(?<![\w\\])'|(?<!\\)'(?!\w)")
+
+# Step outputs beyond this size are truncated before any regex runs so a
+# single huge payload cannot stall the formatter.
+_MAX_LOG_CHARS = 256 * 1024
+
+# Result-dict keys in order of preference for each rendered field.
+_TITLE_KEYS = ("title",)
+_URL_KEYS = ("link", "url", "href")
+_INFO_KEYS = ("snippet", "description", "info")
+
 
 def _parse_search_results(data: Any) -> list[dict] | None:
     """Extract a list of result dicts from parsed Serper-style data."""
@@ -67,31 +115,92 @@ def _parse_search_results(data: Any) -> list[dict] | None:
     return [r for r in results if isinstance(r, dict)] or None
 
 
+def _first(item: dict, keys: tuple[str, ...], default: Any = "N/A") -> Any:
+    """Return the value of the first of *keys* present in *item*."""
+    return next((item[key] for key in keys if key in item), default)
+
+
 def _format_results_block(results: list[dict]) -> str:
     """Render a list of search-result dicts into clean formatted text."""
-    lines: list[str] = []
-    for idx, item in enumerate(results, 1):
-        title = item.get("title", "N/A")
-        link = item.get("link", item.get("url", "N/A"))
-        snippet = item.get("snippet", item.get("description", "N/A"))
-        lines.append(f"### {idx}. {title}")
-        lines.append(f"**URL:** {link}")
-        lines.append(f"**Details:** {snippet}")
-        lines.append("")
-    return "\n".join(lines).strip()
+    entries = [
+        f"### {idx}. {_first(item, _TITLE_KEYS)}\n"
+        f"**URL:** {_first(item, _URL_KEYS)}\n"
+        f"**Details:** {_first(item, _INFO_KEYS)}"
+        for idx, item in enumerate(results, 1)
+    ]
+    return "\n\n".join(entries).strip()
 
 
 def _try_parse_data(raw: str) -> Any | None:
-    """Attempt to parse *raw* as a Python literal or JSON object."""
+    """Attempt to parse *raw* as a JSON object or Python literal.
+
+    Only dict/list payloads are of interest, so anything not starting with
+    ``{`` or ``[`` is rejected without parsing. JSON is tried first with
+    ``orjson``; Python-repr payloads are retried once with their string
+    quotes rewritten to double quotes, and finally with
+    ``ast.literal_eval`` for reprs the rewrite cannot express in JSON
+    (``True``/``None``, plural possessives, embedded ``"``).
+    """
+    stripped = raw.lstrip()
+    if not stripped or stripped[0] not in "{[":
+        return None
     try:
-        return ast.literal_eval(raw)
-    except (ValueError, SyntaxError):
+        return orjson.loads(stripped)
+    except orjson.JSONDecodeError:
         pass
+    if "'" not in stripped:
+        return None
     try:
-        return json.loads(raw)
-    except (json.JSONDecodeError, TypeError):
+        return orjson.loads(_PY_QUOTE_RE.sub('"', stripped))
+    except orjson.JSONDecodeError:
         pass
-    return None
+    try:
+        return ast.literal_eval(stripped)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+
+def _quoted_field(raw: str, start: int, terminator: str) -> tuple[str, int] | None:
+    """Read the quoted value opening at ``raw[start]``.
+
+    The value ends at the first matching quote followed by *terminator*.
+    Returns ``(value, end)`` with *end* the index of the closing quote,
+    or ``None`` when no such quote exists.
+    """
+    quote = raw[start : start + 1]
+    if quote not in ("'", '"'):
+        return None
+    end = raw.find(quote + terminator, start + 2)
+    if end == -1:
+        return None
+    return raw[start + 1 : end], end
+
+
+def _unwrap_tool_result(raw: str) -> str | None:
+    """Return the ``result`` of a ``ToolResult(...)`` repr, if *raw* is one."""
+    if not raw.startswith(_TOOL_RESULT_PREFIX):
+        return None
+    field = _quoted_field(raw, len(_TOOL_RESULT_PREFIX), ", result_as_answer=")
+    if field is not None:
+        return field[0]
+    match = _TOOL_RESULT_RE.match(raw)
+    return match.group(1) if match else None
+
+
+def _unwrap_agent_action(raw: str) -> tuple[str, str] | None:
+    """Return ``(thought, tool)`` of an ``AgentAction(...)`` repr, if any."""
+    if not raw.startswith(_AGENT_ACTION_PREFIX):
+        return None
+    thought = _quoted_field(raw, len(_AGENT_ACTION_PREFIX), ", tool=")
+    if thought is not None:
+        tool_start = thought[1] + len("', tool=")
+        tool = _quoted_field(raw, tool_start, ", ") or _quoted_field(
+            raw, tool_start, ")"
+        )
+        if tool is not None:
+            return thought[0], tool[0]
+    match = _AGENT_ACTION_RE.match(raw)
+    return (match.group(1), match.group(2)) if match else None
 
 
 def _format_log_message(raw: str) -> str:
@@ -102,12 +211,13 @@ def _format_log_message(raw: str) -> str:
       2. ``ToolResult(result=…)`` wrappers emitted by CrewAI.
       3. ``AgentAction(thought=…, tool=…, …)`` wrappers.
     Falls back to the raw string when none of the above match.
+    Input longer than ``_MAX_LOG_CHARS`` is truncated first.
     """
+    raw = raw[:_MAX_LOG_CHARS]
 
     # --- try to unwrap CrewAI ToolResult / AgentAction wrappers ----------
-    tr_match = _TOOL_RESULT_RE.match(raw)
-    if tr_match:
-        inner = tr_match.group(1)
+    inner = _unwrap_tool_result(raw)
+    if inner is not None:
         parsed = _try_parse_data(inner)
         if parsed is not None:
             results = _parse_search_results(parsed)
@@ -115,10 +225,9 @@ def _format_log_message(raw: str) -> str:
                 return f"## 🔍 Search Results\n\n{_format_results_block(results)}"
         return raw
 
-    aa_match = _AGENT_ACTION_RE.match(raw)
-    if aa_match:
-        thought = aa_match.group(1).strip()
-        tool = aa_match.group(2).strip()
+    action = _unwrap_agent_action(raw)
+    if action is not None:
+        thought, tool = (part.strip() for part in action)
         header = f"## 🤖 Agent Action — {tool}\n\n**Thought:** {thought}"
         # Try to extract and format the embedded result if present
         result_marker = "result='"
@@ -145,6 +254,11 @@ def _format_log_message(raw: str) -> str:
     return raw
 
 
+def _format_log_batch(raws: list[str]) -> list[str]:
+    """Format a batch of raw step outputs (one executor hop per batch)."""
+    return [_format_log_message(raw) for raw in raws]
+
+
 # ------------------------------------------------------------------ #
 # SSE streaming endpoint
 # ------------------------------------------------------------------ #
@@ -152,54 +266,88 @@ def _format_log_message(raw: str) -> str:
 async def stream_crew(req: CrewRequest) -> StreamingResponse:
     """Launch the crew and stream real-time agent logs via SSE."""
     try:
-        safety.validate(req.target)
+        get_safety_filter().validate(req.target)
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc))
 
     run_id = str(uuid.uuid4())
 
     async def event_generator():
-        log_queue: asyncio.Queue[str] = asyncio.Queue()
         loop = asyncio.get_running_loop()
+        sink = AsyncStepSink()
 
-        def _step_callback(step_output: Any) -> None:
-            """Push each agent step into the async queue (thread-safe)."""
-            message = _format_log_message(str(step_output))
-            loop.call_soon_threadsafe(log_queue.put_nowait, message)
+        async def _log_frame(batch: list[str]) -> bytes:
+            messages = await loop.run_in_executor(
+                _FORMAT_POOL, _format_log_batch, batch
+            )
+            return _sse_format({"run_id": run_id, "type": "log", "messages": messages})
+
+        cache = get_crew_cache()
+        cached = await asyncio.to_thread(cache.get, req.target, req.pinecone_index)
+        if cached is not None:
+            yield _sse_format(
+                {"run_id": run_id, "type": "start", "message": "Cached report found."}
+            )
+            yield _sse_format(
+                {"run_id": run_id, "type": "result", "message": cached, "cached": True}
+            )
+            yield _sse_format({"run_id": run_id, "type": "done"})
+            return
 
         yield _sse_format({"run_id": run_id, "type": "start", "message": "Crew launched."})
 
         try:
             from backend.services.crew import build_crew
 
+            # Stream runs draw from the same LLM budget as batch runs.
+            limiter = MeteredLimiter(get_rate_limiter())
             crew = build_crew(
                 target=req.target,
                 pinecone_index=req.pinecone_index,
-                step_callback=_step_callback,
+                step_callback=sink.push,
+                max_rpm=None,
+                limiter=limiter,
             )
 
-            task = asyncio.create_task(asyncio.to_thread(crew.kickoff))
-
-            while not task.done():
-                try:
-                    msg = await asyncio.wait_for(log_queue.get(), timeout=1.0)
-                    yield _sse_format({"run_id": run_id, "type": "log", "message": msg})
-                except asyncio.TimeoutError:
-                    yield _sse_format({"run_id": run_id, "type": "ping"})
-
-            # Drain remaining messages
-            while not log_queue.empty():
-                msg = log_queue.get_nowait()
-                yield _sse_format({"run_id": run_id, "type": "log", "message": msg})
-
-            result = task.result()
-            yield _sse_format(
-                {"run_id": run_id, "type": "result", "message": str(result)}
+            kickoff = start_kickoff(crew, limiter, STREAM_POOL)
+            task = asyncio.create_task(
+                wait_for_kickoff(kickoff, limiter, _KICKOFF_TIMEOUT)
             )
+            task.add_done_callback(lambda _: sink.close())
+
+            async with aclosing(aiter(sink)) as batches:
+                async for batch in batches:
+                    if batch:
+                        yield await _log_frame(batch)
+                    else:
+                        yield _sse_format({"run_id": run_id, "type": "ping"})
+            if sink.dropped:
+                logger.warning(
+                    "Run %s dropped %d log lines (queue full)", run_id, sink.dropped
+                )
+
+            report = str(await task)
+            await asyncio.to_thread(cache.put, req.target, req.pinecone_index, report)
+            yield _sse_format({"run_id": run_id, "type": "result", "message": report})
         except ValueError as exc:
             yield _sse_format(
                 {"run_id": run_id, "type": "error", "message": str(exc)}
             )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Run %s timed out after %.0fs; its crew keeps running and the "
+                "report will be cached",
+                run_id,
+                _KICKOFF_TIMEOUT,
+            )
+            cache.put_when_done(kickoff, req.target, req.pinecone_index)
+            yield _sse_format(
+                {
+                    "run_id": run_id,
+                    "type": "error",
+                    "message": f"Crew run timed out after {_KICKOFF_TIMEOUT:.0f}s.",
+                }
+            )
         except Exception as exc:
             logger.exception("Crew run failed")
             yield _sse_format(
@@ -211,6 +359,61 @@ async def stream_crew(req: CrewRequest) -> StreamingResponse:
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
 
+# ------------------------------------------------------------------ #
+# Batch endpoint
+# ------------------------------------------------------------------ #
+@router.post("/crew/batch", response_model=list[CrewResult])
+async def run_crew_batch(req: CrewBatchRequest) -> list[CrewResult]:
+    """Run a crew per target concurrently and return every report.
+
+    Results are in the order of ``req.targets``; cached reports are
+    reused and only the remaining targets are kicked off.
+    """
+    safety = get_safety_filter()
+    for target in req.targets:
+        try:
+            safety.validate(target)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+
+    from backend.services.crew import build_and_run_many
+
+    cache = get_crew_cache()
+    reports = [
+        await asyncio.to_thread(cache.get, target, req.pinecone_index)
+        for target in req.targets
+    ]
+    pending = [i for i, report in enumerate(reports) if report is None]
+    outcomes = await build_and_run_many(
+        [req.targets[i] for i in pending],
+        pinecone_index=req.pinecone_index,
+        concurrency=req.concurrency,
+        timeout=_KICKOFF_TIMEOUT,
+        on_timeout=lambda target, kickoff: cache.put_when_done(
+            kickoff, target, req.pinecone_index
+        ),
+    )
+
+    results = [
+        CrewResult(run_id=str(uuid.uuid4()), status="completed", result=report)
+        for report in reports
+    ]
+    for i, outcome in zip(pending, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            results[i].status = "error"
+            results[i].result = f"Crew run timed out after {_KICKOFF_TIMEOUT:.0f}s."
+        elif isinstance(outcome, BaseException):
+            logger.error("Batch run for %r failed: %s", req.targets[i], outcome)
+            results[i].status = "error"
+            results[i].result = str(outcome)
+        else:
+            await asyncio.to_thread(
+                cache.put, req.targets[i], req.pinecone_index, outcome
+            )
+            results[i].result = outcome
+    return results
+
+
 # ------------------------------------------------------------------ #
 # Health check
 # ------------------------------------------------------------------ #
@@ -222,6 +425,6 @@ async def health_check():
 # ------------------------------------------------------------------ #
 # Helpers
 # ------------------------------------------------------------------ #
-def _sse_format(data: dict) -> str:
-    """Format a dict as an SSE ``data:`` line."""
-    return f"data: {json.dumps(data)}\n\n"
+def _sse_format(data: dict) -> bytes:
+    """Format a dict as a UTF-8 encoded SSE ``data:`` line."""
+    return b"data: " + orjson.dumps(data) + b"\n\n"
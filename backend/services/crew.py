@@ -1,20 +1,27 @@
 """CrewAI Agentic Engine for FalconEye.
 
 Defines the three core agents (Recon, Breach Analyst, Strategy) and
-wires them into a sequential CrewAI process.
+wires them into a CrewAI process where Recon and Breach Analyst run
+concurrently and Strategy fans in both reports.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import threading
+from functools import lru_cache
 from typing import Any, Callable
 
-from crewai import Agent, Crew, Process, Task
+from crewai import LLM, Agent, Crew, Process, Task
 from crewai_tools import SerperDevTool
 
 from backend.memory.rag_pipeline import build_rag_tool
-from backend.services.safety_filter import SafetyFilter
+from backend.services.crew_runner import BATCH_POOL, start_kickoff, wait_for_kickoff
+from backend.services.rate_limiter import Limiter, MeteredLimiter, get_rate_limiter
+from backend.services.safety_filter import get_safety_filter
+from backend.services.strategy_model import ANTHROPIC_STRATEGY_LLM, strategy_model
 
 logger = logging.getLogger(__name__)
 
@@ -27,21 +34,71 @@ GROQ_WORKER_LLM = os.getenv(
 GROQ_ANALYST_LLM = os.getenv(
     "FALCONEYE_ANALYST_LLM", "groq/llama-3.1-8b-instant"
 )
-ANTHROPIC_STRATEGY_LLM = os.getenv(
-    "FALCONEYE_STRATEGY_LLM", "anthropic/claude-3-5-sonnet-20240620"
-)
+# The strategy model is picked per target by backend.services.strategy_model.
+
+# Mark the static system prompt (role, goal, backstory) as cacheable on
+# Anthropic models so repeat runs reuse the provider's prompt cache.
+PREFIX_CACHE = os.getenv("FALCONEYE_PREFIX_CACHE") == "1"
+_SYSTEM_PROMPT_CACHE_POINTS = [{"location": "message", "role": "system"}]
+
 
 # ------------------------------------------------------------------ #
-# Helpers
+# Shared tools – built once so HTTP sessions and schemas are reused
 # ------------------------------------------------------------------ #
-safety = SafetyFilter()
+@lru_cache(maxsize=1)
+def _serper_tool() -> SerperDevTool:
+    return SerperDevTool()
+
+
+_RAG_TOOL_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=16)
+def _cached_rag_tool(pinecone_index: str) -> Any:
+    return build_rag_tool(pinecone_index)
+
+
+def _rag_tool(pinecone_index: str) -> Any:
+    # lru_cache alone lets concurrent misses build the same tool twice.
+    with _RAG_TOOL_LOCK:
+        return _cached_rag_tool(pinecone_index)
+
+
+class _ThrottledLLM(LLM):
+    """``LLM`` that takes a shared rate-limiter slot before every request."""
+
+    def __init__(self, *args: Any, limiter: Limiter, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._limiter = limiter
+
+    def call(self, *args: Any, **kwargs: Any) -> Any:
+        self._limiter.acquire()
+        return super().call(*args, **kwargs)
+
+
+def _llm(model: str, limiter: Limiter | None = None) -> str | LLM:
+    """Return *model* as CrewAI expects it.
+
+    Adds prompt caching when enabled, and gates every request on
+    *limiter* when one is given.
+    """
+    kwargs: dict[str, Any] = {}
+    if PREFIX_CACHE and model.startswith("anthropic/"):
+        # LiteLLM adds ``cache_control: {"type": "ephemeral"}`` to the
+        # system message; the target only appears in later task messages.
+        kwargs["cache_control_injection_points"] = _SYSTEM_PROMPT_CACHE_POINTS
+    if limiter is not None:
+        return _ThrottledLLM(model=model, limiter=limiter, **kwargs)
+    if kwargs:
+        return LLM(model=model, **kwargs)
+    return model
 
 
 # ------------------------------------------------------------------ #
 # Agent Factories
 # ------------------------------------------------------------------ #
-def _build_recon_agent() -> Agent:
-    search_tool = SerperDevTool()
+def _build_recon_agent(limiter: Limiter | None = None) -> Agent:
+    search_tool = _serper_tool()
     return Agent(
         role="Recon Agent",
         goal=(
@@ -54,16 +111,18 @@ def _build_recon_agent() -> Agent:
             "directly and only use publicly available information."
         ),
         tools=[search_tool],
-        llm=GROQ_WORKER_LLM,
+        llm=_llm(GROQ_WORKER_LLM, limiter),
         verbose=True,
         allow_delegation=False,
     )
 
 
-def _build_breach_analyst(pinecone_index: str | None = None) -> Agent:
+def _build_breach_analyst(
+    pinecone_index: str | None = None, limiter: Limiter | None = None
+) -> Agent:
     tools = []
     if pinecone_index:
-        rag_tool = build_rag_tool(pinecone_index)
+        rag_tool = _rag_tool(pinecone_index)
         tools.append(rag_tool)
     return Agent(
         role="Breach Analyst",
@@ -78,13 +137,15 @@ def _build_breach_analyst(pinecone_index: str | None = None) -> Agent:
             "mentions with live OSINT findings."
         ),
         tools=tools,
-        llm=GROQ_ANALYST_LLM,
+        llm=_llm(GROQ_ANALYST_LLM, limiter),
         verbose=True,
         allow_delegation=False,
     )
 
 
-def _build_strategy_agent() -> Agent:
+def _build_strategy_agent(
+    model: str = ANTHROPIC_STRATEGY_LLM, limiter: Limiter | None = None
+) -> Agent:
     return Agent(
         role="Strategy Agent",
         goal=(
@@ -96,34 +157,67 @@ def _build_strategy_agent() -> Agent:
             "You are a red-team consultant who designs phishing simulations "
             "and social-engineering exercises for Fortune-500 companies."
         ),
-        llm=ANTHROPIC_STRATEGY_LLM,
+        llm=_llm(model, limiter),
         verbose=True,
         allow_delegation=False,
     )
 
 
+# ------------------------------------------------------------------ #
+# Task output formats – static, so defined once at import
+# ------------------------------------------------------------------ #
+_RECON_EXPECTED = (
+    "A Markdown report with sections:\n"
+    "## Discovered Resources\n"
+    "For each finding list:\n"
+    "- **Resource:** [Title]\n"
+    "- **URL:** [Link]\n"
+    "- **Info:** [Snippet or description]\n\n"
+    "## Summary\n"
+    "A brief summary of all discovered OSINT data points "
+    "including URLs, usernames, and associated metadata."
+)
+
+_BREACH_EXPECTED = (
+    "A Markdown correlation report with sections:\n"
+    "## Breach Findings\n"
+    "For each finding list:\n"
+    "- **Resource:** [Breach name or source]\n"
+    "- **URL:** [Reference link]\n"
+    "- **Info:** [Breached credentials, exposed PII, or leak details]\n\n"
+    "## Historical References\n"
+    "A list of historical leak references and their relevance."
+)
+
+_STRATEGY_EXPECTED = (
+    "A detailed social-engineering simulation report in Markdown "
+    "format with sections:\n"
+    "## Executive Summary\n"
+    "## Attack Vectors\n"
+    "For each vector list:\n"
+    "- **Resource:** [Vector name]\n"
+    "- **URL:** [Related link if applicable]\n"
+    "- **Info:** [Description and impact]\n\n"
+    "## Phishing Pretexts\n"
+    "## Risk Rating\n"
+    "## Mitigations"
+)
+
+
 # ------------------------------------------------------------------ #
 # Task Factories
 # ------------------------------------------------------------------ #
 def _recon_task(agent: Agent, target: str) -> Task:
+    # Runs concurrently with the breach task; strategy waits for both.
     return Task(
         description=(
             f"Perform passive reconnaissance on the target: '{target}'. "
             "Search for social-media profiles, public records, corporate "
             "registrations, and any other open-source data."
         ),
-        expected_output=(
-            "A Markdown report with sections:\n"
-            "## Discovered Resources\n"
-            "For each finding list:\n"
-            "- **Resource:** [Title]\n"
-            "- **URL:** [Link]\n"
-            "- **Info:** [Snippet or description]\n\n"
-            "## Summary\n"
-            "A brief summary of all discovered OSINT data points "
-            "including URLs, usernames, and associated metadata."
-        ),
+        expected_output=_RECON_EXPECTED,
         agent=agent,
+        async_execution=True,
     )
 
 
@@ -131,45 +225,28 @@ def _breach_task(agent: Agent, target: str) -> Task:
     return Task(
         description=(
             f"Analyse breach and leak databases for any records related "
-            f"to the target: '{target}'. Cross-reference with the recon "
-            "findings provided by the Recon Agent."
-        ),
-        expected_output=(
-            "A Markdown correlation report with sections:\n"
-            "## Breach Findings\n"
-            "For each finding list:\n"
-            "- **Resource:** [Breach name or source]\n"
-            "- **URL:** [Reference link]\n"
-            "- **Info:** [Breached credentials, exposed PII, or leak details]\n\n"
-            "## Historical References\n"
-            "A list of historical leak references and their relevance."
+            f"to the target: '{target}'. Work from the target itself and "
+            "the vector memory; reconnaissance runs in parallel and is "
+            "combined with your findings by the Strategy Agent."
         ),
+        expected_output=_BREACH_EXPECTED,
         agent=agent,
+        async_execution=True,
     )
 
 
-def _strategy_task(agent: Agent, target: str) -> Task:
+def _strategy_task(agent: Agent, target: str, context: list[Task]) -> Task:
     return Task(
         description=(
-            f"Based on all gathered intelligence for '{target}', design "
+            f"Based on all gathered intelligence for '{target}' (the recon "
+            "and breach reports), correlate the findings and design "
             "a social-engineering simulation plan. Include phishing "
             "pretexts, recommended attack vectors, and defensive "
             "mitigations the target should adopt."
         ),
-        expected_output=(
-            "A detailed social-engineering simulation report in Markdown "
-            "format with sections:\n"
-            "## Executive Summary\n"
-            "## Attack Vectors\n"
-            "For each vector list:\n"
-            "- **Resource:** [Vector name]\n"
-            "- **URL:** [Related link if applicable]\n"
-            "- **Info:** [Description and impact]\n\n"
-            "## Phishing Pretexts\n"
-            "## Risk Rating\n"
-            "## Mitigations"
-        ),
+        expected_output=_STRATEGY_EXPECTED,
         agent=agent,
+        context=context,
     )
 
 
@@ -180,6 +257,8 @@ def build_crew(
     target: str,
     pinecone_index: str | None = None,
     step_callback: Callable[[Any], None] | None = None,
+    max_rpm: int | None = 2,  # Groq free-tier rate-limit workaround
+    limiter: Limiter | None = None,
 ) -> Crew:
     """Assemble and return a FalconEye ``Crew`` ready for kick-off.
 
@@ -192,23 +271,90 @@ def build_crew(
     step_callback:
         Optional callback invoked after each agent step – used to push
         live updates to the frontend via SSE.
+    max_rpm:
+        Per-crew request cap; ``None`` when *limiter* enforces a shared
+        limit instead (see :func:`build_and_run_many`).
+    limiter:
+        Optional limiter every agent's LLM acquires before each request.
     """
-    safety.validate(target)
+    get_safety_filter().validate(target)
 
-    recon = _build_recon_agent()
-    analyst = _build_breach_analyst(pinecone_index)
-    strategist = _build_strategy_agent()
+    recon = _build_recon_agent(limiter)
+    analyst = _build_breach_analyst(pinecone_index, limiter)
+    strategist = _build_strategy_agent(strategy_model(target), limiter)
+
+    # Recon and breach analysis are independent, so both run as async
+    # tasks; the strategy task fans in their outputs via ``context``.
+    recon_task = _recon_task(recon, target)
+    breach_task = _breach_task(analyst, target)
 
     crew = Crew(
         agents=[recon, analyst, strategist],
         tasks=[
-            _recon_task(recon, target),
-            _breach_task(analyst, target),
-            _strategy_task(strategist, target),
+            recon_task,
+            breach_task,
+            _strategy_task(strategist, target, context=[recon_task, breach_task]),
         ],
         process=Process.sequential,
-        max_rpm=2,  # Groq free-tier rate-limit workaround
+        max_rpm=max_rpm,
         verbose=True,
         step_callback=step_callback,
     )
     return crew
+
+
+async def build_and_run_many(
+    targets: list[str],
+    pinecone_index: str | None = None,
+    concurrency: int = 8,
+    timeout: float | None = None,
+    on_timeout: Callable[[str, asyncio.Future[Any]], None] | None = None,
+) -> list[str | BaseException]:
+    """Run one crew per target concurrently and return their reports.
+
+    At most *concurrency* crews run at once, on the dedicated
+    :data:`~backend.services.crew_runner.BATCH_POOL`. Instead of each
+    crew's own ``max_rpm``, every agent's LLM acquires a slot from the
+    shared :func:`~backend.services.rate_limiter.get_rate_limiter` budget
+    before each request, so the whole batch respects the account-level
+    cap. A run is abandoned with ``TimeoutError`` after *timeout* seconds
+    of work – time spent waiting for the rate limiter is not counted. Its
+    worker thread cannot be stopped and still finishes in the background,
+    holding its concurrency slot until then; *on_timeout* receives the
+    target and the still-running kick-off future (e.g. to cache the late
+    report). Results are in the order of *targets*; a failed run yields
+    its exception in place of the report.
+    """
+    shared = get_rate_limiter()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run(target: str) -> str:
+        await semaphore.acquire()
+        limiter = MeteredLimiter(shared)
+        try:
+            crew = build_crew(
+                target, pinecone_index=pinecone_index, max_rpm=None, limiter=limiter
+            )
+            kickoff = start_kickoff(crew, limiter, BATCH_POOL)
+        except BaseException:
+            semaphore.release()
+            raise
+        # The slot is freed when the crew actually finishes, not when its
+        # caller stops waiting, so timed-out runs still count.
+        kickoff.add_done_callback(lambda _: semaphore.release())
+        try:
+            return str(await wait_for_kickoff(kickoff, limiter, timeout))
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Batch run for %r timed out after %.0fs; its crew keeps "
+                "running in a worker thread",
+                target,
+                timeout,
+            )
+            if on_timeout is not None:
+                on_timeout(target, kickoff)
+            raise
+
+    return await asyncio.gather(
+        *(_run(target) for target in targets), return_exceptions=True
+    )
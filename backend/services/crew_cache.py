@@ -0,0 +1,180 @@
+"""CrewResultCache – reuse finished FalconEye reports for repeat targets.
+
+Operators often re-scan the same target within a short window. A cache
+hit serves the stored strategy report immediately and skips every LLM,
+Serper and Pinecone round-trip of a full crew run. With semantic lookup
+enabled, cosmetic variants of a target ("Acme Corp" / "acme corp.") also
+reuse the report via one embedding and a similarity check.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+from cachetools import TTLCache
+
+from backend.memory.semantic_cache import SemanticCache
+from backend.services.strategy_model import strategy_model
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAXSIZE = 512
+# Six hours; set FALCONEYE_CREW_CACHE_TTL=0 to always run a fresh crew.
+_DEFAULT_TTL_SECONDS = 6 * 3600
+# Cosine similarity above which two targets count as the same one.
+_SEMANTIC_THRESHOLD = 0.95
+
+
+@dataclass
+class CrewResultCache:
+    """Thread-safe TTL cache of final crew reports keyed by target."""
+
+    maxsize: int = _DEFAULT_MAXSIZE
+    ttl: float = field(
+        default_factory=lambda: float(
+            os.getenv("FALCONEYE_CREW_CACHE_TTL", _DEFAULT_TTL_SECONDS)
+        )
+    )
+    semantic: bool = field(
+        default_factory=lambda: os.getenv("FALCONEYE_SEMANTIC_CREW_CACHE") == "1"
+    )
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _cache: TTLCache = field(init=False, repr=False)
+    _similar: SemanticCache = field(init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._cache = TTLCache(maxsize=self.maxsize, ttl=self.ttl)
+        self._similar = SemanticCache(
+            threshold=_SEMANTIC_THRESHOLD, maxsize=self.maxsize, ttl=self.ttl
+        )
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def key(target: str, pinecone_index: str | None = None) -> str:
+        """Cache key for a run (case-insensitive in the target).
+
+        Includes the strategy model that plans *target*, so a report by
+        the fast model is never served as one by the main model.
+        """
+        model = strategy_model(target)
+        raw = f"{target.strip().lower()}|{pinecone_index or ''}|{model}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, target: str, pinecone_index: str | None = None) -> str | None:
+        """Return the cached report for *target*, or ``None`` on a miss.
+
+        When :attr:`semantic` is set, an exact miss falls back to the
+        report of the most similar earlier target; this embeds *target*,
+        so call it off the event loop. If embedding fails, only the exact
+        cache is consulted.
+        """
+        with self._lock:
+            report = self._cache.get(self.key(target, pinecone_index))
+        if report is None and self.semantic:
+            vector = self._embed(target)
+            if vector is not None:
+                scope = self._scope(target, pinecone_index)
+                report = self._similar.get(vector, scope=scope)
+        with self._lock:
+            if report is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            hits, misses = self.hits, self.misses
+        logger.info(
+            "Crew cache %s for %r (hits=%d, misses=%d)",
+            "miss" if report is None else "hit",
+            target,
+            hits,
+            misses,
+        )
+        return report
+
+    def put(self, target: str, pinecone_index: str | None, report: str) -> None:
+        """Store the final *report* of a successful run."""
+        with self._lock:
+            self._cache[self.key(target, pinecone_index)] = report
+        if self.semantic:
+            vector = self._embed(target)
+            if vector is not None:
+                self._similar.put(
+                    vector, report, scope=self._scope(target, pinecone_index)
+                )
+
+    def put_when_done(
+        self, kickoff: asyncio.Future[Any], target: str, pinecone_index: str | None
+    ) -> None:
+        """Store the report of a still-running *kickoff* once it finishes.
+
+        Used after a run timed out: the crew's worker thread cannot be
+        stopped, so its report is at least kept for the next request.
+        Must be called on the event loop that owns *kickoff*.
+        """
+        task = asyncio.ensure_future(self._put_late(kickoff, target, pinecone_index))
+        _late_puts.add(task)
+        task.add_done_callback(_late_puts.discard)
+
+    def clear(self) -> None:
+        """Drop every cached report."""
+        with self._lock:
+            self._cache.clear()
+        self._similar.clear()
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    async def _put_late(
+        self, kickoff: asyncio.Future[Any], target: str, pinecone_index: str | None
+    ) -> None:
+        try:
+            report = str(await kickoff)
+        except Exception:
+            logger.warning("Timed-out run for %r failed later", target, exc_info=True)
+            return
+        await asyncio.to_thread(self.put, target, pinecone_index, report)
+        logger.info("Cached late report for %r", target)
+
+    @staticmethod
+    def _scope(target: str, pinecone_index: str | None) -> tuple[str | None, str]:
+        # Semantic matches must share both the RAG index and the model tier.
+        return pinecone_index, strategy_model(target)
+
+    @staticmethod
+    def _embed(target: str) -> np.ndarray | None:
+        # A missing or broken embedding model must not fail the run; the
+        # exact cache keeps working without it.
+        try:
+            from backend.memory.embeddings import get_embedder
+
+            return get_embedder().embed_single(target.strip().lower())
+        except Exception:
+            logger.warning(
+                "Semantic crew cache unavailable; using exact matches only",
+                exc_info=True,
+            )
+            return None
+
+
+# Strong references to pending put_when_done tasks so they are not
+# garbage-collected before the late report arrives.
+_late_puts: set[asyncio.Task[None]] = set()
+
+
+@lru_cache(maxsize=1)
+def get_crew_cache() -> CrewResultCache:
+    """Return the process-wide :class:`CrewResultCache`."""
+    return CrewResultCache()
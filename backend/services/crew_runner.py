@@ -0,0 +1,53 @@
+"""Kick off crews on dedicated threads and time them out fairly.
+
+A crew blocks its thread for the whole run, including while its agents
+sleep in the shared rate limiter. Running crews on their own bounded
+pools keeps them from starving the event loop's default executor, and
+:func:`wait_for_kickoff` only charges a run for the time it spends
+working, not for time queued for a thread or a rate-limit slot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any
+
+from backend.services.rate_limiter import MeteredLimiter
+
+# Single-target SSE runs and batch runs get separate pools so a large
+# batch cannot hold every thread an interactive run needs.
+STREAM_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="crew-stream")
+BATCH_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="crew-batch")
+
+
+def start_kickoff(
+    crew: Any, limiter: MeteredLimiter, executor: Executor
+) -> asyncio.Future[Any]:
+    """Run ``crew.kickoff()`` on *executor* and return its future."""
+
+    def _kickoff() -> Any:
+        limiter.start()
+        return crew.kickoff()
+
+    return asyncio.get_running_loop().run_in_executor(executor, _kickoff)
+
+
+async def wait_for_kickoff(
+    kickoff: asyncio.Future[Any], limiter: MeteredLimiter, timeout: float | None
+) -> Any:
+    """Await *kickoff*, raising ``TimeoutError`` after *timeout* active seconds.
+
+    Only :meth:`MeteredLimiter.active_time` counts towards *timeout*. The
+    kick-off itself is never cancelled – its thread cannot be interrupted
+    – so on timeout it keeps running and *kickoff* still resolves later.
+    """
+    if timeout is None:
+        return await asyncio.shield(kickoff)
+    while True:
+        remaining = timeout - limiter.active_time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError
+        done, _ = await asyncio.wait({kickoff}, timeout=remaining)
+        if done:
+            return kickoff.result()
@@ -0,0 +1,105 @@
+"""RateLimiter – one request budget shared by every concurrent crew.
+
+CrewAI's ``max_rpm`` is enforced per crew, so N crews running side by
+side would make N times the allowed LLM calls. A single limiter that all
+crews acquire from keeps batched runs under the provider's account-level
+cap instead.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+# Groq free tier: two requests per minute per account.
+_DEFAULT_MAX_RPM = 2
+
+
+@dataclass
+class RateLimiter:
+    """Thread-safe sliding-window limiter.
+
+    :meth:`acquire` blocks until fewer than *max_rate* acquisitions have
+    happened within the last *period* seconds.
+    """
+
+    max_rate: int
+    period: float = 60.0
+    _calls: deque[float] = field(default_factory=deque, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def acquire(self) -> None:
+        """Block until a slot is free, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_rate:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(wait)
+
+
+@dataclass
+class MeteredLimiter:
+    """One crew run's view of a shared :class:`RateLimiter`.
+
+    Acquires from *limiter* and tracks how long the run has actually been
+    working: wall time since :meth:`start`, minus any time during which
+    at least one of its agents was blocked waiting for a slot.
+    """
+
+    limiter: RateLimiter
+    _started: float | None = field(default=None, init=False, repr=False)
+    _waited: float = field(default=0.0, init=False, repr=False)
+    _waiting: int = field(default=0, init=False, repr=False)
+    _wait_since: float = field(default=0.0, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def start(self) -> None:
+        """Mark the moment the run began executing."""
+        with self._lock:
+            self._started = time.monotonic()
+
+    def acquire(self) -> None:
+        """Take a slot from the shared limiter, metering the wait."""
+        with self._lock:
+            if self._waiting == 0:
+                self._wait_since = time.monotonic()
+            self._waiting += 1
+        try:
+            self.limiter.acquire()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+                if self._waiting == 0:
+                    self._waited += time.monotonic() - self._wait_since
+
+    def active_time(self) -> float:
+        """Seconds spent running and not waiting on the limiter."""
+        with self._lock:
+            if self._started is None:
+                return 0.0
+            now = time.monotonic()
+            waited = self._waited + (now - self._wait_since if self._waiting else 0.0)
+            return now - self._started - waited
+
+
+# Anything an LLM wrapper can acquire a request slot from.
+Limiter = RateLimiter | MeteredLimiter
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide LLM :class:`RateLimiter`."""
+    return RateLimiter(int(os.getenv("FALCONEYE_MAX_RPM", _DEFAULT_MAX_RPM)))
@@ -8,29 +8,66 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 
 # Domains that must never be searched or scraped.
 _BLOCKED_TLDS: tuple[str, ...] = (".gov", ".edu", ".mil")
 
+# Characters the domain pattern accepts immediately before a TLD.
+_DOMAIN_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789-")
 
-@dataclass
+# Longer queries are rejected outright so no input can keep the regex busy.
+_MAX_QUERY_CHARS = 4096
+
+
+@dataclass(frozen=True, slots=True)
 class SafetyFilter:
     """Block reconnaissance queries that target sensitive domains."""
 
     blocked_tlds: tuple[str, ...] = field(default_factory=lambda: _BLOCKED_TLDS)
+    _pattern: re.Pattern[str] = field(init=False, repr=False, compare=False)
+    _dotted: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # One alternation over every TLD, e.g. "[a-z0-9\-]+(?:\.gov|\.edu)\b".
+        tlds = "|".join(re.escape(tld) for tld in self.blocked_tlds)
+        # An empty alternation would match every word; "(?!)" never matches.
+        pattern = re.compile(rf"[a-z0-9\-]+(?:{tlds})\b" if tlds else "(?!)")
+        object.__setattr__(self, "_pattern", pattern)
+        # With only dotted TLDs, text without a "." cannot match any of them.
+        object.__setattr__(
+            self, "_dotted", all("." in tld for tld in self.blocked_tlds)
+        )
 
     # ------------------------------------------------------------------ #
     # Public API
     # ------------------------------------------------------------------ #
     def is_safe(self, query: str) -> bool:
-        """Return ``True`` when *query* does **not** reference a blocked TLD."""
-        return not self._contains_blocked_domain(query)
+        """Return ``True`` when *query* does **not** reference a blocked TLD.
+
+        Queries longer than ``_MAX_QUERY_CHARS`` are never considered safe.
+        """
+        if len(query) > _MAX_QUERY_CHARS:
+            return False
+        lower = _lower(query.strip())
+        # Fast paths for the common bare-domain target: it either ends in a
+        # blocked TLD or contains none of them, so no regex is needed.
+        if self._ends_with_blocked_domain(lower):
+            return False
+        if not self._mentions_blocked_tld(lower):
+            return True
+        return self._pattern.search(lower) is None
 
     def validate(self, query: str) -> str:
         """Return the query unchanged if safe, otherwise raise ``ValueError``."""
-        if not self.is_safe(query):
-            blocked = self._find_blocked_domains(query)
+        if len(query) > _MAX_QUERY_CHARS:
+            raise ValueError(
+                f"Query too long – at most {_MAX_QUERY_CHARS} characters allowed"
+            )
+        # One scan both decides and collects the domains for the message.
+        blocked = self._find_blocked_domains(query)
+        if blocked:
             raise ValueError(
                 f"Query blocked – references sensitive domain(s): {', '.join(blocked)}"
             )
@@ -39,18 +76,32 @@ class SafetyFilter:
     # ------------------------------------------------------------------ #
     # Internals
     # ------------------------------------------------------------------ #
-    def _contains_blocked_domain(self, text: str) -> bool:
-        lower = text.lower()
+    def _ends_with_blocked_domain(self, lower: str) -> bool:
         for tld in self.blocked_tlds:
-            # Match "example.gov", "sub.example.edu", etc.
-            if re.search(rf"[a-z0-9\-]+\{tld}\b", lower):
-                return True
+            if lower.endswith(tld):
+                head = lower[: -len(tld)]
+                return bool(head) and head[-1] in _DOMAIN_CHARS
         return False
 
+    def _mentions_blocked_tld(self, lower: str) -> bool:
+        if self._dotted and "." not in lower:
+            return False
+        return any(tld in lower for tld in self.blocked_tlds)
+
     def _find_blocked_domains(self, text: str) -> list[str]:
-        lower = text.lower()
-        found: list[str] = []
-        for tld in self.blocked_tlds:
-            matches = re.findall(rf"[a-z0-9\-]+\{tld}\b", lower)
-            found.extend(matches)
-        return found
+        # Match "example.gov", "sub.example.edu", etc.
+        lower = _lower(text)
+        if not self._mentions_blocked_tld(lower):
+            return []
+        return self._pattern.findall(lower)
+
+
+def _lower(text: str) -> str:
+    # Targets are usually lowercase already; skip the copy in that case.
+    return text if text.islower() else text.lower()
+
+
+@lru_cache(maxsize=1)
+def get_safety_filter() -> SafetyFilter:
+    """Return the process-wide default :class:`SafetyFilter`."""
+    return SafetyFilter()
@@ -0,0 +1,97 @@
+"""AsyncStepSink – bridges CrewAI's synchronous step callback to asyncio.
+
+The crew runs in a worker thread and reports every agent step through a
+plain callback. The sink's ``push`` method can be handed to CrewAI
+as-is; the SSE generator consumes the steps with ``async for`` instead
+of polling a queue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+
+@dataclass
+class AsyncStepSink:
+    """Collect step outputs from any thread and yield them as batches.
+
+    Iterating yields lists of at most *max_batch* raw step strings, or an
+    empty list as a keep-alive tick every *ping_interval* seconds without
+    output. Iteration ends once :meth:`close` has been called and every
+    queued step has been yielded. When more than *maxsize* steps are
+    pending, the oldest ones are dropped and counted in :attr:`dropped`.
+
+    Must be created inside the event loop that consumes it.
+    """
+
+    maxsize: int = 1024
+    max_batch: int = 32
+    ping_interval: float = 15.0
+    dropped: int = field(default=0, init=False)
+    _loop: asyncio.AbstractEventLoop = field(init=False, repr=False)
+    _queue: asyncio.Queue[str] = field(init=False, repr=False)
+    _closed: asyncio.Event = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._closed = asyncio.Event()
+
+    # ------------------------------------------------------------------ #
+    # Producer side
+    # ------------------------------------------------------------------ #
+    def push(self, step_output: Any) -> None:
+        """Enqueue one step; safe to call from any thread."""
+        self._loop.call_soon_threadsafe(self._enqueue, str(step_output))
+
+    def close(self) -> None:
+        """End iteration after the queued steps (call on the loop thread)."""
+        self._closed.set()
+
+    # ------------------------------------------------------------------ #
+    # Consumer side
+    # ------------------------------------------------------------------ #
+    async def __aiter__(self) -> AsyncIterator[list[str]]:
+        # Wake only for a step, a keep-alive tick, or close().
+        get_task = asyncio.ensure_future(self._queue.get())
+        ping_task = asyncio.ensure_future(asyncio.sleep(self.ping_interval))
+        closed_task = asyncio.ensure_future(self._closed.wait())
+        try:
+            while not closed_task.done():
+                done, _ = await asyncio.wait(
+                    {get_task, ping_task, closed_task},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if get_task in done:
+                    yield self._take_batch(get_task.result())
+                    get_task = asyncio.ensure_future(self._queue.get())
+                if ping_task in done:
+                    yield []
+                    ping_task = asyncio.ensure_future(asyncio.sleep(self.ping_interval))
+
+            if get_task.done():
+                yield self._take_batch(get_task.result())
+        finally:
+            get_task.cancel()
+            ping_task.cancel()
+            closed_task.cancel()
+
+        while not self._queue.empty():
+            yield self._take_batch()
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    def _enqueue(self, raw: str) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(raw)
+
+    def _take_batch(self, first: str | None = None) -> list[str]:
+        batch = [] if first is None else [first]
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
@@ -0,0 +1,39 @@
+"""Pick the strategy model that plans a given target.
+
+Kept free of CrewAI imports so the crew cache can key reports by the
+model that wrote them without loading the agent stack.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+
+ANTHROPIC_STRATEGY_LLM = os.getenv(
+    "FALCONEYE_STRATEGY_LLM", "anthropic/claude-3-5-sonnet-20240620"
+)
+# Optional cheaper strategy model for bare apex domains (unset = always
+# use the main strategy model).
+STRATEGY_LLM_FAST = os.getenv("FALCONEYE_STRATEGY_LLM_FAST")
+
+# Only a bare registrable domain ("acme.com") counts as simple enough for
+# the fast model; subdomains, names, handles and free text do not.
+_FAST_TARGET_RE = re.compile(r"[a-z0-9-]{1,63}\.[a-z]{2,24}")
+_FAST_TARGET_MAX_CHARS = 24
+
+
+def prefers_fast_strategy(target: str) -> bool:
+    """Whether *target* should be planned by the fast strategy model."""
+    target = target.strip().lower()
+    return (
+        bool(STRATEGY_LLM_FAST)
+        and len(target) <= _FAST_TARGET_MAX_CHARS
+        and _FAST_TARGET_RE.fullmatch(target) is not None
+    )
+
+
+def strategy_model(target: str) -> str:
+    """Return the model identifier that plans *target*."""
+    if prefers_fast_strategy(target):
+        return STRATEGY_LLM_FAST
+    return ANTHROPIC_STRATEGY_LLM
@@ -0,0 +1,227 @@
+"""Tests for the crew factory and batch runner, against a stub ``crewai``."""
+
+import asyncio
+import importlib
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.services import strategy_model
+from backend.services.rate_limiter import RateLimiter
+
+
+class _FakeLLM:
+    calls: list[float] = []
+    _calls_lock = threading.Lock()
+
+    def __init__(self, model, **kwargs):
+        self.model = model
+        self.additional_params = kwargs
+
+    def call(self, messages, **kwargs):
+        with self._calls_lock:
+            self.calls.append(time.monotonic())
+        return "ok"
+
+
+class _FakeAgent:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class _FakeTask(_FakeAgent):
+    pass
+
+
+class _FakeCrew(_FakeAgent):
+    llm_calls_per_agent = 2
+    delay = 0.0
+
+    def kickoff(self):
+        target = self.tasks[0].description.split("'")[1]
+        if "fail" in target:
+            raise RuntimeError(f"crew failed for {target}")
+        time.sleep(self.delay)
+        for agent in self.agents:
+            for _ in range(self.llm_calls_per_agent):
+                if isinstance(agent.llm, _FakeLLM):
+                    agent.llm.call([{"role": "user", "content": target}])
+        return f"# Report for {target}"
+
+
+@pytest.fixture
+def crew(monkeypatch):
+    """Import ``backend.services.crew`` with ``crewai`` replaced by stubs."""
+    crewai = types.ModuleType("crewai")
+    crewai.LLM = _FakeLLM
+    crewai.Agent = _FakeAgent
+    crewai.Task = _FakeTask
+    crewai.Crew = _FakeCrew
+    crewai.Process = types.SimpleNamespace(sequential="sequential")
+    crewai_tools = types.ModuleType("crewai_tools")
+    crewai_tools.SerperDevTool = lambda: object()
+    monkeypatch.setitem(sys.modules, "crewai", crewai)
+    monkeypatch.setitem(sys.modules, "crewai_tools", crewai_tools)
+    monkeypatch.delitem(sys.modules, "backend.services.crew", raising=False)
+    monkeypatch.setattr(_FakeLLM, "calls", [])
+
+    module = importlib.import_module("backend.services.crew")
+    yield module
+    sys.modules.pop("backend.services.crew", None)
+
+
+class TestBuildAndRunMany:
+    def test_reports_in_target_order(self, crew, monkeypatch):
+        monkeypatch.setattr(crew, "get_rate_limiter", lambda: RateLimiter(100))
+        targets = ["a.example.com", "b.example.com", "c.example.com"]
+        reports = asyncio.run(crew.build_and_run_many(targets))
+        assert reports == [f"# Report for {t}" for t in targets]
+
+    def test_failed_run_returns_exception_in_place(self, crew, monkeypatch):
+        monkeypatch.setattr(crew, "get_rate_limiter", lambda: RateLimiter(100))
+        reports = asyncio.run(
+            crew.build_and_run_many(["ok.example.com", "fail.example.com"])
+        )
+        assert reports[0] == "# Report for ok.example.com"
+        assert isinstance(reports[1], RuntimeError)
+
+    def test_blocked_target_returns_value_error(self, crew, monkeypatch):
+        monkeypatch.setattr(crew, "get_rate_limiter", lambda: RateLimiter(100))
+        reports = asyncio.run(crew.build_and_run_many(["pentagon.mil"]))
+        assert isinstance(reports[0], ValueError)
+
+    def test_llm_calls_share_one_budget(self, crew, monkeypatch):
+        limiter = RateLimiter(max_rate=4, period=0.3)
+        monkeypatch.setattr(crew, "get_rate_limiter", lambda: limiter)
+        asyncio.run(crew.build_and_run_many(["a.example.com", "b.example.com"]))
+
+        calls = sorted(_FakeLLM.calls)
+        assert len(calls) == 12  # 2 crews x 3 agents x 2 calls
+        # No window of one period ever holds more calls than the cap.
+        for i in range(len(calls) - 4):
+            assert calls[i + 4] - calls[i] >= 0.3 - 0.01
+
+    def test_agents_use_throttled_llms_without_per_crew_rpm(self, crew):
+        limiter = RateLimiter(100)
+        built = crew.build_crew("example.com", max_rpm=None, limiter=limiter)
+        assert built.max_rpm is None
+        assert all(isinstance(a.llm, crew._ThrottledLLM) for a in built.agents)
+
+    def test_timeout_returns_timeout_error(self, crew, monkeypatch):
+        monkeypatch.setattr(crew, "get_rate_limiter", lambda: RateLimiter(100))
+        monkeypatch.setattr(_FakeCrew, "delay", 0.3)
+        late = {}
+
+        async def run():
+            reports = await crew.build_and_run_many(
+                ["slow.example.com"],
+                timeout=0.05,
+                on_timeout=lambda target, kickoff: late.update({target: kickoff}),
+            )
+            return reports, await late["slow.example.com"]
+
+        reports, late_report = asyncio.run(run())
+        assert isinstance(reports[0], asyncio.TimeoutError)
+        assert late_report == "# Report for slow.example.com"
+
+    def test_timed_out_run_keeps_its_slot(self, crew, monkeypatch):
+        monkeypatch.setattr(crew, "get_rate_limiter", lambda: RateLimiter(100))
+        monkeypatch.setattr(_FakeCrew, "delay", 0.2)
+        running = []
+        peak = []
+        kickoff = _FakeCrew.kickoff
+
+        def tracked(self):
+            running.append(1)
+            peak.append(len(running))
+            try:
+                return kickoff(self)
+            finally:
+                running.pop()
+
+        monkeypatch.setattr(_FakeCrew, "kickoff", tracked)
+        targets = [f"t{i}.example.com" for i in range(4)]
+        late = []
+
+        async def run():
+            reports = await crew.build_and_run_many(
+                targets,
+                concurrency=2,
+                timeout=0.05,
+                on_timeout=lambda target, kickoff: late.append(kickoff),
+            )
+            await asyncio.gather(*late)
+            return reports
+
+        reports = asyncio.run(run())
+        assert all(isinstance(r, asyncio.TimeoutError) for r in reports)
+        assert max(peak) == 2
+
+    def test_limiter_wait_not_charged_to_timeout(self, crew, monkeypatch):
+        limiter = RateLimiter(max_rate=1, period=0.1)
+        monkeypatch.setattr(crew, "get_rate_limiter", lambda: limiter)
+        # Six throttled calls wait ~0.5s in the limiter, well past the timeout.
+        reports = asyncio.run(
+            crew.build_and_run_many(["a.example.com"], timeout=0.2)
+        )
+        assert reports == ["# Report for a.example.com"]
+
+    def test_batch_leaves_default_executor_free(self, crew, monkeypatch):
+        monkeypatch.setattr(crew, "get_rate_limiter", lambda: RateLimiter(100))
+        monkeypatch.setattr(_FakeCrew, "delay", 0.3)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+            batch = asyncio.ensure_future(
+                crew.build_and_run_many(["a.example.com", "b.example.com"])
+            )
+            await asyncio.sleep(0.05)
+            start = time.monotonic()
+            await asyncio.to_thread(lambda: None)
+            waited = time.monotonic() - start
+            await batch
+            return waited
+
+        assert asyncio.run(run()) < 0.1
+
+
+class TestLlm:
+    def test_anthropic_model_gets_cache_injection_points(self, crew, monkeypatch):
+        monkeypatch.setattr(crew, "PREFIX_CACHE", True)
+        llm = crew._llm("anthropic/claude-3-5-sonnet-20240620")
+        assert isinstance(llm, _FakeLLM)
+        assert llm.model == "anthropic/claude-3-5-sonnet-20240620"
+        assert llm.additional_params == {
+            "cache_control_injection_points": [{"location": "message", "role": "system"}]
+        }
+
+    def test_other_models_stay_plain_strings(self, crew, monkeypatch):
+        monkeypatch.setattr(crew, "PREFIX_CACHE", True)
+        assert crew._llm("groq/llama-3.1-8b-instant") == "groq/llama-3.1-8b-instant"
+
+    def test_flag_off_keeps_anthropic_plain(self, crew, monkeypatch):
+        monkeypatch.setattr(crew, "PREFIX_CACHE", False)
+        assert crew._llm("anthropic/claude") == "anthropic/claude"
+
+    def test_limiter_keeps_cache_injection_points(self, crew, monkeypatch):
+        monkeypatch.setattr(crew, "PREFIX_CACHE", True)
+        llm = crew._llm("anthropic/claude", RateLimiter(100))
+        assert isinstance(llm, crew._ThrottledLLM)
+        assert "cache_control_injection_points" in llm.additional_params
+
+
+class TestStrategyModel:
+    def test_strategy_agent_uses_given_model(self, crew):
+        assert crew._build_strategy_agent("groq/fast").llm == "groq/fast"
+        assert crew._build_strategy_agent().llm == crew.ANTHROPIC_STRATEGY_LLM
+
+    def test_build_crew_uses_fast_model_for_bare_domain(self, crew, monkeypatch):
+        monkeypatch.setattr(strategy_model, "STRATEGY_LLM_FAST", "groq/fast")
+        assert crew.build_crew("acme.com").agents[-1].llm == "groq/fast"
+        built = crew.build_crew("Acme Corp")
+        assert built.agents[-1].llm == crew.ANTHROPIC_STRATEGY_LLM
@@ -0,0 +1,94 @@
+"""Tests for the CrewResultCache TTL report cache."""
+
+import time
+
+import numpy as np
+
+from backend.memory.embeddings import get_embedder
+from backend.services import strategy_model
+from backend.services.crew_cache import CrewResultCache, get_crew_cache
+
+
+class TestCrewResultCache:
+    def test_miss_then_hit(self):
+        cache = CrewResultCache()
+        assert cache.get("example.com") is None
+        cache.put("example.com", None, "# Report")
+        assert cache.get("example.com") == "# Report"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_key_ignores_target_case_and_whitespace(self):
+        assert CrewResultCache.key(" Example.COM ") == CrewResultCache.key(
+            "example.com"
+        )
+
+    def test_index_is_part_of_key(self):
+        cache = CrewResultCache()
+        cache.put("example.com", "breaches", "# With RAG")
+        assert cache.get("example.com") is None
+        assert cache.get("example.com", "breaches") == "# With RAG"
+
+    def test_strategy_model_is_part_of_key(self, monkeypatch):
+        cache = CrewResultCache()
+        cache.put("acme.com", None, "# Main model")
+        monkeypatch.setattr(strategy_model, "STRATEGY_LLM_FAST", "groq/fast")
+        assert cache.get("acme.com") is None
+        cache.put("acme.com", None, "# Fast model")
+        assert cache.get("acme.com") == "# Fast model"
+
+    def test_entries_expire(self):
+        cache = CrewResultCache(ttl=0.01)
+        cache.put("example.com", None, "# Report")
+        time.sleep(0.02)
+        assert cache.get("example.com") is None
+
+    def test_ttl_from_env(self, monkeypatch):
+        monkeypatch.setenv("FALCONEYE_CREW_CACHE_TTL", "60")
+        assert CrewResultCache().ttl == 60.0
+
+    def test_clear(self):
+        cache = CrewResultCache()
+        cache.put("example.com", None, "# Report")
+        cache.clear()
+        assert cache.get("example.com") is None
+
+
+def _fake_encode(self, texts, batch_size):
+    # "acme" variants share one direction; anything else is orthogonal.
+    return np.array(
+        [[1.0, 0.0] if t.startswith("acme") else [0.0, 1.0] for t in texts],
+        dtype=np.float32,
+    )
+
+
+class TestSemanticLookup:
+    def test_near_duplicate_target_reuses_report(self, monkeypatch):
+        monkeypatch.setattr(type(get_embedder()), "_encode", _fake_encode)
+        cache = CrewResultCache(semantic=True)
+        cache.put("Acme Corp", None, "# Acme")
+        assert cache.get("acme corp.") == "# Acme"
+        assert cache.get("Globex") is None
+
+    def test_scoped_by_index(self, monkeypatch):
+        monkeypatch.setattr(type(get_embedder()), "_encode", _fake_encode)
+        cache = CrewResultCache(semantic=True)
+        cache.put("Acme Corp", "breaches", "# Acme")
+        assert cache.get("acme corp.") is None
+
+    def test_embed_failure_falls_back_to_exact_cache(self, monkeypatch):
+        def _broken_encode(self, texts, batch_size):
+            raise ModuleNotFoundError("No module named 'torch'")
+
+        monkeypatch.setattr(type(get_embedder()), "_encode", _broken_encode)
+        cache = CrewResultCache(semantic=True)
+        cache.put("Initech", None, "# Initech")
+        assert cache.get("initech") == "# Initech"
+        assert cache.get("initech inc.") is None
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("FALCONEYE_SEMANTIC_CREW_CACHE", raising=False)
+        assert CrewResultCache().semantic is False
+
+
+def test_get_crew_cache_is_singleton():
+    assert get_crew_cache() is get_crew_cache()
@@ -0,0 +1,91 @@
+"""Tests for the EmbeddingService LRU cache."""
+
+import sys
+
+import numpy as np
+import pytest
+
+from backend.memory.embeddings import EmbeddingService, get_embedder
+
+
+class _FakeEncoder:
+    """Stand-in for the transformer forward pass that records its inputs."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str], batch_size: int) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def encoder(monkeypatch) -> _FakeEncoder:
+    fake = _FakeEncoder()
+    monkeypatch.setattr(EmbeddingService, "_encode", fake)
+    return fake
+
+
+class TestEmbedCache:
+    def test_preserves_input_order(self, encoder: _FakeEncoder):
+        svc = EmbeddingService()
+        result = svc.embed(["a", "bbb", "cc"])
+        assert result.tolist() == [[1.0, 1.0], [3.0, 1.0], [2.0, 1.0]]
+
+    def test_repeat_texts_hit_cache(self, encoder: _FakeEncoder):
+        svc = EmbeddingService()
+        svc.embed(["alpha", "beta"])
+        svc.embed(["beta", "gamma"])
+        assert encoder.calls == [["alpha", "beta"], ["gamma"]]
+
+    def test_duplicates_within_call_encoded_once(self, encoder: _FakeEncoder):
+        svc = EmbeddingService()
+        result = svc.embed(["dup", "dup", "other"])
+        assert encoder.calls == [["dup", "other"]]
+        assert result[0].tolist() == result[1].tolist()
+
+    def test_evicts_least_recently_used(self, encoder: _FakeEncoder):
+        svc = EmbeddingService(cache_size=2)
+        svc.embed(["a", "b"])
+        svc.embed(["a"])  # refresh "a" so "b" is the oldest entry
+        svc.embed(["c"])
+        svc.embed(["a", "b"])
+        assert encoder.calls[-1] == ["b"]
+
+    def test_returns_float32_matrix(self, encoder: _FakeEncoder):
+        result = EmbeddingService().embed(["a", "b"])
+        assert result.dtype == np.float32
+        assert result.shape == (2, 2)
+
+    def test_empty_input(self, encoder: _FakeEncoder):
+        assert len(EmbeddingService().embed([])) == 0
+        assert encoder.calls == []
+
+
+class TestTextToId:
+    def test_is_deterministic(self):
+        assert EmbeddingService.text_to_id("abc") == EmbeddingService.text_to_id("abc")
+
+    def test_is_16_hex_chars(self):
+        text_id = EmbeddingService.text_to_id("some chunk")
+        assert len(text_id) == 16
+        int(text_id, 16)
+
+    def test_differs_per_text(self):
+        assert EmbeddingService.text_to_id("a") != EmbeddingService.text_to_id("b")
+
+
+class TestGetEmbedder:
+    def test_returns_shared_instance(self):
+        assert get_embedder() is get_embedder()
+
+    def test_distinct_per_model(self):
+        assert get_embedder("model-a") is not get_embedder("model-b")
+
+
+class TestMissingDependencies:
+    def test_encode_raises_install_hint(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "torch", None)
+        monkeypatch.setitem(sys.modules, "sentence_transformers", None)
+        with pytest.raises(ImportError, match="pip install sentence-transformers"):
+            EmbeddingService().embed(["text"])
@@ -2,9 +2,11 @@
 
 import json
 
-import pytest
-
-from backend.routes.crew_routes import _format_log_message
+from backend.routes.crew_routes import (
+    _MAX_LOG_CHARS,
+    _format_log_message,
+    _unwrap_tool_result,
+)
 
 
 class TestFormatLogMessagePlainText:
@@ -75,6 +77,17 @@ class TestFormatLogMessageSerperJSON:
         assert "Only Title" in result
         assert "N/A" in result
 
+    def test_href_and_info_keys_recognised(self):
+        data = [{"title": "T", "href": "https://href.com", "info": "extra"}]
+        result = _format_log_message(json.dumps(data))
+        assert "**URL:** https://href.com" in result
+        assert "**Details:** extra" in result
+
+    def test_preferred_key_wins(self):
+        data = [{"title": "T", "url": "https://url.com", "link": "https://link.com"}]
+        result = _format_log_message(json.dumps(data))
+        assert "**URL:** https://link.com" in result
+
     def test_output_uses_markdown_headers(self):
         data = {
             "organic": [
@@ -90,6 +103,18 @@ class TestFormatLogMessageSerperJSON:
         assert "**URL:**" in result
         assert "**Details:**" in result
 
+    def test_entries_numbered_and_separated_by_blank_line(self):
+        data = [
+            {"title": "A", "link": "https://a.com", "snippet": "alpha"},
+            {"title": "B", "link": "https://b.com", "snippet": "beta"},
+        ]
+        result = _format_log_message(json.dumps(data))
+        assert result == (
+            "## 🔍 Search Results\n\n"
+            "### 1. A\n**URL:** https://a.com\n**Details:** alpha\n\n"
+            "### 2. B\n**URL:** https://b.com\n**Details:** beta"
+        )
+
 
 class TestFormatLogMessageFallback:
     def test_dict_without_results_returns_raw(self):
@@ -107,8 +132,111 @@ class TestFormatLogMessageFallback:
         raw = json.dumps(data)
         assert _format_log_message(raw) == raw
 
+    def test_leading_whitespace_json_parsed(self):
+        data = {"organic": [{"title": "Spaced", "link": "https://s.com"}]}
+        assert "Spaced" in _format_log_message("  \n" + json.dumps(data))
+
+    def test_non_container_literal_returns_raw(self):
+        assert _format_log_message("42") == "42"
+
     def test_python_repr_dict_parsed(self):
         raw = "{'organic': [{'title': 'Test', 'link': 'https://test.com', 'snippet': 'hello'}]}"
         result = _format_log_message(raw)
         assert "Test" in result
         assert "https://test.com" in result
+
+
+class TestFormatLogMessageCrewWrappers:
+    _PAYLOAD = "{'organic': [{'title': 'Wrapped', 'link': 'https://w.com'}]}"
+
+    def test_tool_result_with_search_payload(self):
+        raw = f'ToolResult(result="{self._PAYLOAD}", result_as_answer=False)'
+        result = _format_log_message(raw)
+        assert result.startswith("## 🔍 Search Results")
+        assert "Wrapped" in result
+        assert "https://w.com" in result
+
+    def test_tool_result_with_plain_text_returns_raw(self):
+        raw = "ToolResult(result='nothing found', result_as_answer=False)"
+        assert _format_log_message(raw) == raw
+
+    def test_agent_action_header(self):
+        raw = (
+            "AgentAction(thought='I should search', tool='Search the internet', "
+            "tool_input='{\"q\": \"acme\"}', text='...')"
+        )
+        result = _format_log_message(raw)
+        assert result == (
+            "## 🤖 Agent Action — Search the internet\n\n**Thought:** I should search"
+        )
+
+    def test_agent_action_with_embedded_result(self):
+        raw = (
+            "AgentAction(thought='Looking', tool=\"Search\", tool_input='{}', "
+            f"text='...', result='{self._PAYLOAD}')"
+        )
+        result = _format_log_message(raw)
+        assert result.startswith("## 🤖 Agent Action — Search")
+        assert "### 1. Wrapped" in result
+
+    def test_mismatched_quotes_fall_back_to_regex(self):
+        raw = "ToolResult(result='abc\",  result_as_answer=False)"
+        assert _unwrap_tool_result(raw) == "abc"
+
+    def test_double_quoted_thought(self):
+        raw = 'AgentAction(thought="it\'s time", tool=\'Search\', text=\'\')'
+        assert "**Thought:** it's time" in _format_log_message(raw)
+
+
+class TestFormatLogMessageLimits:
+    def test_oversized_input_is_truncated(self):
+        raw = "x" * (_MAX_LOG_CHARS + 10)
+        assert _format_log_message(raw) == "x" * _MAX_LOG_CHARS
+
+
+class TestFormatLogMessagePythonRepr:
+    def test_apostrophe_inside_double_quoted_value(self):
+        raw = "{'organic': [{'title': \"Bob's page\", 'link': 'https://b.com'}]}"
+        result = _format_log_message(raw)
+        assert "Bob's page" in result
+        assert "https://b.com" in result
+
+    def test_list_of_repr_dicts(self):
+        raw = "[{'title': 'Listed', 'url': 'https://l.com'}]"
+        assert "Listed" in _format_log_message(raw)
+
+    def test_repr_with_embedded_double_quote_parsed(self):
+        raw = "{'organic': [{'title': 'say \"hi\"'}]}"
+        assert 'say "hi"' in _format_log_message(raw)
+
+    def test_repr_with_true_and_none_parsed(self):
+        raw = (
+            "{'searchParameters': {'q': 'acme', 'autocorrect': True}, "
+            "'organic': [{'title': \"The users' data\", 'link': 'https://a.com', "
+            "'snippet': None}]}"
+        )
+        for payload in (raw, f'ToolResult(result="{raw}", result_as_answer=False)'):
+            result = _format_log_message(payload)
+            assert result.startswith("## 🔍 Search Results")
+            assert "The users' data" in result
+            assert "**Details:** None" in result
+
+    def test_escaped_apostrophe_in_tool_result_kept(self):
+        payload = {
+            "organic": [
+                {
+                    "title": "Bob's Pizza",
+                    "link": "https://bob.example.com",
+                    "snippet": "Open late.",
+                }
+            ]
+        }
+        raw = f"ToolResult(result={json.dumps(payload)!r}, result_as_answer=False)"
+        result = _format_log_message(raw)
+        assert result.startswith("## 🔍 Search Results")
+        assert "Bob's Pizza" in result
+        assert 'Bob"s' not in result
+
+    def test_unparseable_repr_returns_raw(self):
+        raw = "{'organic': [{'title': 'unterminated}]}"
+        assert _format_log_message(raw) == raw
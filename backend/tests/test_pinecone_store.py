@@ -0,0 +1,208 @@
+"""Tests for PineconeStore batching (no network – uses a fake index)."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.memory import pinecone_store
+from backend.memory.embeddings import EmbeddingService, get_embedder, quantize_int8
+from backend.memory.pinecone_store import Hit, PineconeStore, get_store
+
+
+class _FakeAsyncResult:
+    def __init__(self, error: Exception | None = None):
+        self._error = error
+
+    def get(self):
+        if self._error is not None:
+            raise self._error
+
+
+class _FakeIndex:
+    """Records upserted batches; optionally fails the first async batch."""
+
+    def __init__(self, fail_first: bool = False):
+        self.batches: list[list[dict]] = []
+        self._fail_first = fail_first
+
+    def upsert(self, vectors, async_req: bool = False):
+        if async_req and self._fail_first:
+            self._fail_first = False
+            return _FakeAsyncResult(RuntimeError("429 Too Many Requests"))
+        self.batches.append(vectors)
+        return _FakeAsyncResult() if async_req else None
+
+
+@pytest.fixture(autouse=True)
+def fake_encoder(monkeypatch):
+    monkeypatch.setattr(
+        EmbeddingService, "_encode", lambda self, texts, bs: np.zeros((len(texts), 4))
+    )
+    monkeypatch.setattr(pinecone_store, "_UPSERT_BACKOFF_SECONDS", 0)
+
+
+def _store(index: _FakeIndex) -> PineconeStore:
+    store = PineconeStore(index_name="test", embedding_service=EmbeddingService())
+    store._index = index
+    return store
+
+
+class TestUpsert:
+    def test_splits_into_batches_of_100(self):
+        index = _FakeIndex()
+        texts = [f"chunk {i}" for i in range(250)]
+        assert _store(index).upsert(texts) == 250
+        assert [len(b) for b in index.batches] == [100, 100, 50]
+
+    def test_retries_failed_batch(self):
+        index = _FakeIndex(fail_first=True)
+        texts = [f"chunk {i}" for i in range(150)]
+        assert _store(index).upsert(texts) == 150
+        assert sorted(len(b) for b in index.batches) == [50, 100]
+
+    def test_bounds_batches_in_flight(self, monkeypatch):
+        monkeypatch.setattr(pinecone_store, "_POOL_THREADS", 2)
+        index = _FakeIndex()
+        in_flight = []
+        peak = []
+
+        class _Tracked(_FakeAsyncResult):
+            def get(self):
+                in_flight.pop()
+
+        upsert = index.upsert
+
+        def tracked(vectors, async_req=False):
+            upsert(vectors, async_req)
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            return _Tracked()
+
+        monkeypatch.setattr(index, "upsert", tracked)
+        texts = [f"chunk {i}" for i in range(550)]
+        assert _store(index).upsert(texts) == 550
+        assert len(index.batches) == 6
+        assert max(peak) == 2
+        assert not in_flight
+
+    def test_metadata_includes_text(self):
+        index = _FakeIndex()
+        _store(index).upsert(["hello"], [{"source": "web"}])
+        assert index.batches[0][0]["metadata"] == {"source": "web", "text": "hello"}
+
+
+class _QueryIndex:
+    def __init__(self):
+        self.calls = 0
+
+    def query(self, vector, top_k, include_metadata):
+        self.calls += 1
+        match = SimpleNamespace(id="1", score=0.9, metadata={"text": "hit"})
+        return SimpleNamespace(matches=[match])
+
+    def upsert(self, vectors, async_req: bool = False):
+        return _FakeAsyncResult() if async_req else None
+
+
+class TestQueryCache:
+    @pytest.fixture(autouse=True)
+    def text_encoder(self, monkeypatch):
+        def encode(self, texts, batch_size):
+            # "paris" and "Paris" embed almost identically; others do not.
+            vecs = {"paris": [1.0, 0.0], "Paris": [0.999, 0.045]}
+            return np.array([vecs.get(t, [0.0, 1.0]) for t in texts])
+
+        monkeypatch.setattr(EmbeddingService, "_encode", encode)
+
+    def test_returns_hits(self):
+        hits = _store(_QueryIndex()).query("paris")
+        assert hits == [Hit(id="1", score=0.9, text="hit", metadata={"text": "hit"})]
+
+    def test_repeat_query_hits_cache(self):
+        index = _QueryIndex()
+        store = _store(index)
+        first = store.query("paris", top_k=5)
+        assert store.query("paris", top_k=5) == first
+        assert index.calls == 1
+
+    def test_similar_query_hits_cache(self):
+        index = _QueryIndex()
+        store = _store(index)
+        store.query("paris")
+        store.query("Paris")
+        assert index.calls == 1
+
+    def test_different_top_k_misses(self):
+        index = _QueryIndex()
+        store = _store(index)
+        store.query("paris", top_k=5)
+        store.query("paris", top_k=3)
+        assert index.calls == 2
+
+    def test_upsert_invalidates_cache(self):
+        index = _QueryIndex()
+        store = _store(index)
+        store.query("paris")
+        store.upsert(["new chunk"])
+        store.query("paris")
+        assert index.calls == 2
+
+
+class TestGetStore:
+    def test_shared_per_index(self):
+        assert get_store("shared") is get_store("shared")
+        assert get_store("shared") is not get_store("other")
+
+    def test_uses_shared_embedder(self):
+        assert get_store("shared").embedding_service is get_embedder()
+
+
+class _QuantizedIndex:
+    """Records upserts and query arguments; returns two fixed matches."""
+
+    def __init__(self):
+        self.upserted: list[dict] = []
+        self.query_kwargs: dict = {}
+
+    def upsert(self, vectors, async_req: bool = False):
+        self.upserted.extend(vectors)
+        return _FakeAsyncResult() if async_req else None
+
+    def query(self, **kwargs):
+        self.query_kwargs = kwargs
+        return SimpleNamespace(
+            matches=[
+                SimpleNamespace(id="a", score=0.99, metadata={}),
+                SimpleNamespace(id="b", score=0.98, metadata=None),
+            ]
+        )
+
+
+class TestQuantize:
+    @pytest.fixture(autouse=True)
+    def unit_encoder(self, monkeypatch):
+        monkeypatch.setattr(
+            EmbeddingService, "_encode", lambda self, texts, bs: np.array([[0.6, -0.8]])
+        )
+
+    def test_quantize_int8_scales_and_clips(self):
+        q = quantize_int8(np.array([[1.0, -1.0, 0.5, 0.0]]))
+        assert q.dtype == np.int8
+        assert q.tolist() == [[127, -127, 64, 0]]
+
+    def test_upsert_sends_int8_values(self):
+        index = _QuantizedIndex()
+        store = _store(index)
+        store.quantize = True
+        store.upsert(["chunk"])
+        assert index.upserted[0]["values"] == [76.0, -102.0]
+
+    def test_query_uses_pinecone_ranking_without_overfetch(self):
+        index = _QuantizedIndex()
+        store = _store(index)
+        store.quantize = True
+        hits = store.query("question", top_k=2)
+        assert index.query_kwargs["top_k"] == 2
+        assert "include_values" not in index.query_kwargs
+        assert [(h.id, h.score) for h in hits] == [("a", 0.99), ("b", 0.98)]
@@ -0,0 +1,75 @@
+"""Tests for chunking and async ingest in rag_pipeline."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from backend.memory import rag_pipeline
+from backend.memory.embeddings import EmbeddingService
+from backend.memory.pinecone_store import PineconeStore
+from backend.memory.rag_pipeline import chunk_text, ingest_text_async
+
+
+class TestChunkText:
+    def test_empty_text(self):
+        assert chunk_text("") == []
+
+    def test_short_text_single_chunk(self):
+        assert chunk_text("hello", max_chars=10, overlap=2) == ["hello"]
+
+    def test_chunks_overlap(self):
+        assert chunk_text("abcdefghij", max_chars=4, overlap=1) == [
+            "abcd",
+            "defg",
+            "ghij",
+            "j",
+        ]
+
+    def test_chunk_length_bounded(self):
+        chunks = chunk_text("x" * 1234, max_chars=500, overlap=50)
+        assert all(len(c) <= 500 for c in chunks)
+        assert len(chunks) == 3
+
+    def test_rejects_overlap_not_smaller_than_max_chars(self):
+        with pytest.raises(ValueError, match="overlap"):
+            chunk_text("abc", max_chars=5, overlap=5)
+
+
+class _RecordingIndex:
+    def __init__(self):
+        self.vectors: list[dict] = []
+
+    def upsert(self, vectors, async_req: bool = False):
+        self.vectors.extend(vectors)
+        return _Done() if async_req else None
+
+
+class _Done:
+    def get(self):
+        return None
+
+
+class TestIngestTextAsync:
+    @pytest.fixture
+    def index(self, monkeypatch) -> _RecordingIndex:
+        def encode(self, texts, batch_size):
+            return np.ones((len(texts), 3), dtype=np.float32)
+
+        monkeypatch.setattr(EmbeddingService, "_encode", encode)
+        index = _RecordingIndex()
+        store = PineconeStore(index_name="test", embedding_service=EmbeddingService())
+        store._index = index
+        monkeypatch.setattr(rag_pipeline, "get_store", lambda name: store)
+        return index
+
+    def test_upserts_every_chunk(self, index: _RecordingIndex):
+        text = "".join(f"{i:05d}" for i in range(1000))  # 5000 unique chars
+        total = asyncio.run(ingest_text_async(text, "test", source="web", max_chars=60))
+        assert total == len(chunk_text(text, max_chars=60)) > 100
+        assert len(index.vectors) == total
+        assert all(v["metadata"]["source"] == "web" for v in index.vectors)
+
+    def test_empty_text(self, index: _RecordingIndex):
+        assert asyncio.run(ingest_text_async("", "test")) == 0
+        assert index.vectors == []
@@ -0,0 +1,61 @@
+"""Tests for the shared sliding-window RateLimiter."""
+
+import threading
+import time
+
+from backend.services.rate_limiter import MeteredLimiter, RateLimiter, get_rate_limiter
+
+
+class TestRateLimiter:
+    def test_allows_max_rate_without_waiting(self):
+        limiter = RateLimiter(max_rate=3, period=10.0)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        assert time.monotonic() - start < 0.1
+
+    def test_blocks_until_window_frees(self):
+        limiter = RateLimiter(max_rate=2, period=0.2)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.2
+
+    def test_budget_shared_across_threads(self):
+        limiter = RateLimiter(max_rate=2, period=0.2)
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(4)]
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert time.monotonic() - start >= 0.2
+
+
+class TestMeteredLimiter:
+    def test_no_active_time_before_start(self):
+        assert MeteredLimiter(RateLimiter(1)).active_time() == 0.0
+
+    def test_limiter_wait_not_counted(self):
+        limiter = MeteredLimiter(RateLimiter(max_rate=1, period=0.3))
+        limiter.start()
+        limiter.acquire()
+        limiter.acquire()  # waits ~0.3s for the window to free
+        assert limiter.active_time() < 0.1
+
+    def test_overlapping_waits_counted_once(self):
+        limiter = MeteredLimiter(RateLimiter(max_rate=1, period=0.3))
+        limiter.start()
+        limiter.acquire()
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # Both threads waited, one of them twice as long; none of it counts,
+        # but the waits must not be subtracted twice either.
+        assert 0.0 <= limiter.active_time() < 0.1
+
+
+def test_get_rate_limiter_is_singleton():
+    assert get_rate_limiter() is get_rate_limiter()
@@ -1,35 +1,216 @@
-"""Tests for crew_routes (health-check and input validation)."""
+"""Tests for crew_routes (health-check, input validation and streaming)."""
 
+import asyncio
+import json
+import sys
+import time
+import types
+
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
 
 from backend.main import app
+from backend.routes import crew_routes
+from backend.routes.crew_routes import _sse_format
+from backend.services.crew_cache import get_crew_cache
+
 
-client = TestClient(app)
+@pytest_asyncio.fixture
+async def client():
+    """In-process ASGI client; no server thread or extra event loop."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
 
 
+@pytest.mark.asyncio
 class TestHealthCheck:
-    def test_health_returns_ok(self):
-        resp = client.get("/api/health")
+    async def test_health_returns_ok(self, client):
+        resp = await client.get("/api/health")
         assert resp.status_code == 200
         assert resp.json() == {"status": "ok"}
 
 
+@pytest.mark.asyncio
 class TestRootEndpoint:
-    def test_root(self):
-        resp = client.get("/")
+    async def test_root(self, client):
+        resp = await client.get("/")
         assert resp.status_code == 200
         body = resp.json()
         assert body["app"] == "FalconEye"
 
 
+@pytest.mark.asyncio
 class TestCrewStreamValidation:
-    def test_rejects_blocked_domain(self):
-        resp = client.post(
+    async def test_rejects_blocked_domain(self, client):
+        resp = await client.post(
             "/api/crew/stream", json={"target": "pentagon.mil"}
         )
         assert resp.status_code == 422
 
-    def test_rejects_empty_target(self):
-        resp = client.post("/api/crew/stream", json={"target": ""})
+    async def test_rejects_empty_target(self, client):
+        resp = await client.post("/api/crew/stream", json={"target": ""})
+        assert resp.status_code == 422
+
+
+class _FakeCrew:
+    steps = ["step one", "step two"]
+    delay = 0.0
+
+    def __init__(self, step_callback):
+        self._step_callback = step_callback
+
+    def kickoff(self):
+        for step in self.steps:
+            self._step_callback(step)
+        time.sleep(self.delay)
+        return "# Final Report"
+
+
+@pytest.fixture(autouse=True)
+def _empty_crew_cache():
+    get_crew_cache().clear()
+    yield
+    get_crew_cache().clear()
+
+
+@pytest.fixture
+def fake_crew(monkeypatch):
+    """Replace ``backend.services.crew`` with a crew that needs no LLMs."""
+    module = types.ModuleType("backend.services.crew")
+    module.build_crew = lambda target, pinecone_index, step_callback, **_: _FakeCrew(
+        step_callback
+    )
+
+    async def build_and_run_many(
+        targets, pinecone_index=None, concurrency=8, timeout=None, on_timeout=None
+    ):
+        return [
+            ValueError("boom") if "fail" in t else f"# Report for {t}"
+            for t in targets
+        ]
+
+    module.build_and_run_many = build_and_run_many
+    monkeypatch.setitem(sys.modules, "backend.services.crew", module)
+    return _FakeCrew
+
+
+def _events(body: str) -> list[dict]:
+    return [
+        json.loads(line[len("data: "):])
+        for line in body.split("\n\n")
+        if line.startswith("data: ")
+    ]
+
+
+@pytest.mark.asyncio
+class TestCrewStream:
+    async def test_streams_logs_then_result(self, client, fake_crew):
+        resp = await client.post("/api/crew/stream", json={"target": "example.com"})
+        assert resp.status_code == 200
+        events = [e for e in _events(resp.text) if e["type"] != "ping"]
+        types_ = [e["type"] for e in events]
+        assert types_[0] == "start"
+        assert types_[-2:] == ["result", "done"]
+        logs = [m for e in events if e["type"] == "log" for m in e["messages"]]
+        assert logs == ["step one", "step two"]
+        assert events[-2]["message"] == "# Final Report"
+
+    async def test_batches_log_lines_per_frame(self, client, fake_crew, monkeypatch):
+        monkeypatch.setattr(fake_crew, "steps", [f"step {i}" for i in range(100)])
+        resp = await client.post("/api/crew/stream", json={"target": "example.com"})
+        frames = [e for e in _events(resp.text) if e["type"] == "log"]
+        logs = [m for e in frames for m in e["messages"]]
+        assert logs == [f"step {i}" for i in range(100)]
+        assert all(len(e["messages"]) <= 32 for e in frames)
+
+    async def test_timeout_reports_error_after_partial_logs(
+        self, client, fake_crew, monkeypatch
+    ):
+        monkeypatch.setattr(fake_crew, "delay", 0.5)
+        monkeypatch.setattr(crew_routes, "_KICKOFF_TIMEOUT", 0.05)
+        resp = await client.post("/api/crew/stream", json={"target": "slow.example.com"})
+        events = [e for e in _events(resp.text) if e["type"] != "ping"]
+        logs = [m for e in events if e["type"] == "log" for m in e["messages"]]
+        assert logs == ["step one", "step two"]
+        assert [e["type"] for e in events[-2:]] == ["error", "done"]
+        assert "timed out" in events[-2]["message"]
+        assert get_crew_cache().get("slow.example.com") is None
+
+        # The abandoned crew still finishes; its report is kept for next time.
+        await asyncio.sleep(0.6)
+        assert get_crew_cache().get("slow.example.com") == "# Final Report"
+
+    async def test_repeat_target_served_from_cache(
+        self, client, fake_crew, monkeypatch
+    ):
+        await client.post("/api/crew/stream", json={"target": "example.com"})
+        monkeypatch.delitem(sys.modules, "backend.services.crew")
+
+        resp = await client.post("/api/crew/stream", json={"target": "Example.com"})
+        events = _events(resp.text)
+        assert [e["type"] for e in events] == ["start", "result", "done"]
+        assert events[1]["message"] == "# Final Report"
+        assert events[1]["cached"] is True
+
+
+class TestSseFormat:
+    def test_returns_single_data_frame_bytes(self):
+        frame = _sse_format({"type": "ping"})
+        assert frame == b'data: {"type":"ping"}\n\n'
+
+    def test_escapes_newlines_in_message(self):
+        frame = _sse_format({"type": "log", "message": "line1\nline2"})
+        assert frame.count(b"\n") == 2
+        assert b"line1\\nline2" in frame
+
+
+@pytest.mark.asyncio
+class TestCrewBatch:
+    async def test_returns_reports_in_target_order(self, client, fake_crew):
+        resp = await client.post(
+            "/api/crew/batch", json={"targets": ["a.example.com", "b.example.com"]}
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [r["result"] for r in body] == [
+            "# Report for a.example.com",
+            "# Report for b.example.com",
+        ]
+        assert {r["status"] for r in body} == {"completed"}
+
+    async def test_failed_target_reported_as_error(self, client, fake_crew):
+        resp = await client.post(
+            "/api/crew/batch", json={"targets": ["ok.example.com", "fail.example.com"]}
+        )
+        body = resp.json()
+        assert [r["status"] for r in body] == ["completed", "error"]
+        assert body[1]["result"] == "boom"
+        assert get_crew_cache().get("fail.example.com") is None
+
+    async def test_reuses_cached_reports(self, client, fake_crew):
+        get_crew_cache().put("cached.example.com", None, "# Cached")
+        resp = await client.post(
+            "/api/crew/batch", json={"targets": ["cached.example.com", "new.example.com"]}
+        )
+        assert [r["result"] for r in resp.json()] == [
+            "# Cached",
+            "# Report for new.example.com",
+        ]
+
+    async def test_rejects_empty_target(self, client, fake_crew):
+        resp = await client.post(
+            "/api/crew/batch", json={"targets": ["example.com", ""]}
+        )
+        assert resp.status_code == 422
+
+    async def test_rejects_overlong_target(self, client, fake_crew):
+        resp = await client.post("/api/crew/batch", json={"targets": ["a" * 201]})
+        assert resp.status_code == 422
+
+    async def test_rejects_blocked_target(self, client, fake_crew):
+        resp = await client.post(
+            "/api/crew/batch", json={"targets": ["example.com", "pentagon.mil"]}
+        )
         assert resp.status_code == 422
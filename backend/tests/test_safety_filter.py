@@ -1,8 +1,10 @@
 """Tests for SafetyFilter."""
 
+import dataclasses
+
 import pytest
 
-from backend.services.safety_filter import SafetyFilter
+from backend.services.safety_filter import SafetyFilter, get_safety_filter
 
 
 @pytest.fixture
@@ -35,6 +37,18 @@ class TestIsSafe:
     def test_blocks_in_sentence(self, sf: SafetyFilter):
         assert sf.is_safe("search for info on cia.gov site") is False
 
+    def test_blocks_url_without_whitespace(self, sf: SafetyFilter):
+        assert sf.is_safe("https://army.mil/careers") is False
+
+    def test_blocks_with_surrounding_whitespace(self, sf: SafetyFilter):
+        assert sf.is_safe("  MIT.EDU  ") is False
+
+    def test_bare_tld_is_not_a_domain(self, sf: SafetyFilter):
+        assert sf.is_safe(".gov") is True
+
+    def test_tld_lookalike_is_safe(self, sf: SafetyFilter):
+        assert sf.is_safe("example.government.com") is True
+
 
 # ------------------------------------------------------------------ #
 # validate
@@ -51,3 +65,64 @@ class TestValidate:
     def test_error_lists_blocked_domains(self, sf: SafetyFilter):
         with pytest.raises(ValueError, match="army.mil"):
             sf.validate("look up army.mil records")
+
+    def test_error_lists_every_blocked_domain(self, sf: SafetyFilter):
+        with pytest.raises(ValueError, match="mit.edu, army.mil"):
+            sf.validate("compare mit.edu and army.mil")
+
+    def test_mixed_case_domain_reported_lowercase(self, sf: SafetyFilter):
+        with pytest.raises(ValueError, match="whitehouse.gov"):
+            sf.validate("WhiteHouse.GOV")
+
+    def test_mixed_case_safe_query_returned_unchanged(self, sf: SafetyFilter):
+        assert sf.validate("Example.COM") == "Example.COM"
+
+    def test_rejects_overlong_query(self, sf: SafetyFilter):
+        with pytest.raises(ValueError, match="too long"):
+            sf.validate("a" * 4097)
+
+    def test_overlong_query_is_not_safe(self, sf: SafetyFilter):
+        assert sf.is_safe("a" * 4097) is False
+
+    def test_query_at_limit_is_checked_normally(self, sf: SafetyFilter):
+        assert sf.validate("a" * 4096) == "a" * 4096
+
+
+# ------------------------------------------------------------------ #
+# custom TLDs
+# ------------------------------------------------------------------ #
+class TestCustomTlds:
+    def test_custom_tld_blocked(self):
+        assert SafetyFilter(blocked_tlds=(".int",)).is_safe("nato.int") is False
+
+    def test_default_tlds_not_blocked_when_overridden(self):
+        assert SafetyFilter(blocked_tlds=(".int",)).is_safe("army.mil") is True
+
+    def test_no_tlds_blocks_nothing(self):
+        assert SafetyFilter(blocked_tlds=()).is_safe("army.mil") is True
+
+    def test_undotted_tld_still_checked_without_dot(self):
+        assert SafetyFilter(blocked_tlds=("gov",)).is_safe("whitehousegov") is False
+
+
+# ------------------------------------------------------------------ #
+# immutability
+# ------------------------------------------------------------------ #
+class TestImmutability:
+    def test_is_frozen(self, sf: SafetyFilter):
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            sf.blocked_tlds = (".com",)
+
+    def test_is_hashable(self):
+        assert hash(SafetyFilter()) == hash(SafetyFilter())
+
+
+# ------------------------------------------------------------------ #
+# get_safety_filter
+# ------------------------------------------------------------------ #
+class TestGetSafetyFilter:
+    def test_returns_shared_instance(self):
+        assert get_safety_filter() is get_safety_filter()
+
+    def test_uses_default_tlds(self):
+        assert get_safety_filter().is_safe("army.mil") is False
@@ -0,0 +1,50 @@
+"""Tests for SemanticCache."""
+
+import numpy as np
+import pytest
+
+from backend.memory.semantic_cache import SemanticCache
+
+
+def _unit(*values: float) -> np.ndarray:
+    vec = np.array(values, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+@pytest.fixture
+def cache() -> SemanticCache:
+    return SemanticCache(threshold=0.98, maxsize=4, ttl=60)
+
+
+class TestSemanticCache:
+    def test_empty_cache_misses(self, cache: SemanticCache):
+        assert cache.get(_unit(1, 0)) is None
+
+    def test_near_identical_vector_hits(self, cache: SemanticCache):
+        cache.put(_unit(1, 0), "stored")
+        assert cache.get(_unit(1, 0.01)) == "stored"
+
+    def test_dissimilar_vector_misses(self, cache: SemanticCache):
+        cache.put(_unit(1, 0), "stored")
+        assert cache.get(_unit(1, 1)) is None
+
+    def test_scope_must_match(self, cache: SemanticCache):
+        cache.put(_unit(1, 0), "top5", scope=5)
+        assert cache.get(_unit(1, 0), scope=3) is None
+        assert cache.get(_unit(1, 0), scope=5) == "top5"
+
+    def test_expired_entries_miss(self):
+        cache = SemanticCache(ttl=0)
+        cache.put(_unit(1, 0), "stored")
+        assert cache.get(_unit(1, 0)) is None
+
+    def test_oldest_slot_overwritten_when_full(self, cache: SemanticCache):
+        cache.put(_unit(1, 0), "first")
+        for i in range(1, 5):
+            cache.put(_unit(i, 10), f"filler {i}")
+        assert cache.get(_unit(1, 0)) is None
+
+    def test_clear(self, cache: SemanticCache):
+        cache.put(_unit(1, 0), "stored")
+        cache.clear()
+        assert cache.get(_unit(1, 0)) is None
@@ -0,0 +1,70 @@
+"""Tests for AsyncStepSink."""
+
+import asyncio
+
+from backend.services.step_sink import AsyncStepSink
+
+
+async def _collect(sink: AsyncStepSink) -> list[list[str]]:
+    return [batch async for batch in sink]
+
+
+class TestAsyncStepSink:
+    def test_yields_pushed_steps_then_stops_on_close(self):
+        async def scenario():
+            sink = AsyncStepSink()
+            sink.push("one")
+            sink.push("two")
+            asyncio.get_running_loop().call_soon(sink.close)
+            return await _collect(sink)
+
+        batches = asyncio.run(scenario())
+        assert [step for batch in batches for step in batch] == ["one", "two"]
+
+    def test_push_from_worker_thread(self):
+        async def scenario():
+            sink = AsyncStepSink()
+
+            def work():
+                for i in range(5):
+                    sink.push(i)
+
+            task = asyncio.create_task(asyncio.to_thread(work))
+            task.add_done_callback(lambda _: sink.close())
+            return await _collect(sink)
+
+        batches = asyncio.run(scenario())
+        assert [step for batch in batches for step in batch] == [str(i) for i in range(5)]
+
+    def test_batches_are_bounded(self):
+        async def scenario():
+            sink = AsyncStepSink(max_batch=3)
+            for i in range(7):
+                sink.push(i)
+            asyncio.get_running_loop().call_soon(sink.close)
+            return await _collect(sink)
+
+        batches = asyncio.run(scenario())
+        assert all(len(batch) <= 3 for batch in batches)
+        assert sum(len(batch) for batch in batches) == 7
+
+    def test_drops_oldest_when_full(self):
+        async def scenario():
+            sink = AsyncStepSink(maxsize=2)
+            for step in ("a", "b", "c"):
+                sink.push(step)
+            asyncio.get_running_loop().call_soon(sink.close)
+            return sink, await _collect(sink)
+
+        sink, batches = asyncio.run(scenario())
+        assert [step for batch in batches for step in batch] == ["b", "c"]
+        assert sink.dropped == 1
+
+    def test_yields_empty_batch_as_keep_alive(self):
+        async def scenario():
+            sink = AsyncStepSink(ping_interval=0.01)
+            asyncio.get_running_loop().call_later(0.05, sink.close)
+            return await _collect(sink)
+
+        batches = asyncio.run(scenario())
+        assert [] in batches
@@ -0,0 +1,44 @@
+"""Tests for per-target strategy model selection."""
+
+import pytest
+
+from backend.services import strategy_model
+from backend.services.strategy_model import prefers_fast_strategy
+
+
+@pytest.fixture
+def fast_model(monkeypatch):
+    monkeypatch.setattr(strategy_model, "STRATEGY_LLM_FAST", "groq/fast")
+
+
+class TestPrefersFastStrategy:
+    @pytest.mark.parametrize("target", ["acme.com", " ACME.io ", "my-shop.co"])
+    def test_bare_domain_is_fast(self, fast_model, target):
+        assert prefers_fast_strategy(target) is True
+
+    @pytest.mark.parametrize(
+        "target",
+        [
+            "mail.acme.com",
+            "Acme Corp",
+            "@acme",
+            "john.doe@acme.com",
+            "acme",
+            "a-very-long-company-name.com",
+        ],
+    )
+    def test_other_targets_use_main_model(self, fast_model, target):
+        assert prefers_fast_strategy(target) is False
+
+    def test_never_fast_without_fast_model(self, monkeypatch):
+        monkeypatch.setattr(strategy_model, "STRATEGY_LLM_FAST", None)
+        assert prefers_fast_strategy("acme.com") is False
+
+
+class TestStrategyModel:
+    def test_picks_model_per_target(self, fast_model):
+        assert strategy_model.strategy_model("acme.com") == "groq/fast"
+        assert (
+            strategy_model.strategy_model("Acme Corp")
+            == strategy_model.ANTHROPIC_STRATEGY_LLM
+        )
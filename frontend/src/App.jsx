@@ -51,13 +51,15 @@ export default function App() {
             const payload = JSON.parse(line.slice(6));
 
             if (payload.type === "log" || payload.type === "start") {
+              // Log frames batch several lines in `messages`.
+              const messages = payload.messages ?? [payload.message];
               setLogs((prev) => [
                 ...prev,
-                {
+                ...messages.map((message) => ({
                   id: Date.now() + Math.random(),
                   type: payload.type,
-                  message: payload.message,
-                },
+                  message,
+                })),
               ]);
             } else if (payload.type === "result") {
               setReport(payload.message);